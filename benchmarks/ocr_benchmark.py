@@ -0,0 +1,131 @@
+# benchmarks/ocr_benchmark.py
+"""
+Benchmarks for the OCR pipeline in logic/ocr.py.
+
+Run from the project root:
+
+    python benchmarks/ocr_benchmark.py handoff scan.pdf --pages 50 --dpi 300
+    python benchmarks/ocr_benchmark.py engines scan.pdf --lang deu+eng
+
+handoff: per-page cost of handing a rendered pixmap to Pillow, comparing the
+         old PNG encode/decode round trip with the raw sample buffer path.
+engines: pages/sec of each available OCR engine on the same rendered pages.
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+
+# Allow "python benchmarks/ocr_benchmark.py" from the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz  # PyMuPDF
+import pytesseract
+from PIL import Image
+
+from logic.ocr import pixmap_to_image, create_ocr_engine
+
+
+def _png_round_trip(pix):
+    img = Image.open(io.BytesIO(pix.tobytes("png")))
+    img.load()  # Force the decode, as Tesseract would
+    return img
+
+
+def _time_per_page(func, pixmaps):
+    timings = []
+    for pix in pixmaps:
+        start = time.perf_counter()
+        func(pix)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _render_pages(input_path, pages, dpi):
+    with fitz.open(input_path) as doc:
+        count = min(pages, len(doc)) if pages else len(doc)
+        return [doc.load_page(i).get_pixmap(dpi=dpi) for i in range(count)]
+
+
+def _report(label, timings):
+    mean_ms = statistics.mean(timings) * 1000
+    median_ms = statistics.median(timings) * 1000
+    print(f"{label:<12} mean {mean_ms:8.2f} ms/page | median {median_ms:8.2f} ms/page")
+    return mean_ms
+
+
+def bench_handoff(args):
+    pixmaps = _render_pages(args.input, args.pages, args.dpi)
+    if not pixmaps:
+        print("No pages to render")
+        return
+    size_mb = sum(len(pix.samples) for pix in pixmaps) / (1024 * 1024)
+    print(f"{len(pixmaps)} pages at {args.dpi} DPI ({size_mb:.1f} MB of samples)\n")
+
+    png_ms = _report("PNG", _time_per_page(_png_round_trip, pixmaps))
+    raw_ms = _report("Raw buffer", _time_per_page(pixmap_to_image, pixmaps))
+    print(f"\nSaved {png_ms - raw_ms:.2f} ms/page ({png_ms / raw_ms if raw_ms else 0:.1f}x faster)")
+
+
+def bench_engines(args):
+    images = [pixmap_to_image(pix) for pix in _render_pages(args.input, args.pages, args.dpi)]
+    if not images:
+        print("No pages to OCR")
+        return
+    print(f"{len(images)} pages at {args.dpi} DPI, language {args.lang}\n")
+
+    rates = {}
+    for name in ("pytesseract", "tesserocr"):
+        try:
+            start = time.perf_counter()
+            engine = create_ocr_engine(name, args.lang)
+            init_seconds = time.perf_counter() - start
+        except (ImportError, RuntimeError) as e:
+            print(f"{name:<12} unavailable ({e})")
+            continue
+
+        try:
+            start = time.perf_counter()
+            for image in images:
+                engine.recognize(image)
+            elapsed = time.perf_counter() - start
+        except pytesseract.TesseractNotFoundError as e:
+            # pytesseract only looks for the tesseract binary on the first page
+            print(f"{name:<12} unavailable ({e})")
+            continue
+        finally:
+            engine.close()
+
+        rates[name] = len(images) / elapsed if elapsed else 0
+        print(f"{name:<12} {rates[name]:6.2f} pages/sec | init {init_seconds * 1000:.0f} ms | "
+              f"{elapsed / len(images) * 1000:.0f} ms/page")
+
+    if len(rates) == 2 and rates["pytesseract"]:
+        print(f"\ntesserocr is {rates['tesserocr'] / rates['pytesseract']:.2f}x pytesseract")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='OCR pipeline benchmarks')
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    handoff = subparsers.add_parser('handoff', help='Pixmap to PIL handoff: PNG round trip vs raw samples')
+    handoff.add_argument('input', help='PDF to render')
+    handoff.add_argument('--pages', type=int, default=20, help='Number of pages to render (0 = all)')
+    handoff.add_argument('--dpi', type=int, default=300, help='Render resolution')
+    handoff.set_defaults(handler=bench_handoff)
+
+    engines = subparsers.add_parser('engines', help='Pages/sec of pytesseract vs tesserocr')
+    engines.add_argument('input', help='PDF to OCR')
+    engines.add_argument('--pages', type=int, default=10, help='Number of pages to OCR (0 = all)')
+    engines.add_argument('--dpi', type=int, default=300, help='Render resolution')
+    engines.add_argument('--lang', default='eng', help='Tesseract language(s), e.g. deu+eng')
+    engines.set_defaults(handler=bench_engines)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
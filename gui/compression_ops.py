@@ -6,15 +6,17 @@ import threading
 import time
 import datetime
 from tkinter import ttk, filedialog, messagebox
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed
 import subprocess
 import sys
 from threading import Lock
 
 # Local imports
-from logic.compression import compress_pdf, find_pdfs
+from logic.compression import compress_pdf, find_pdfs, create_executor
+from logic.progress import ThroughputEstimator
 from .utils import ToolTip, CustomText
-from .utils import truncate_path, is_directory_writable
+from .utils import truncate_path, is_directory_writable, format_time
+from .progress_bus import ProgressBus
 
 
 class CompressionOps:
@@ -25,6 +27,7 @@ class CompressionOps:
         self.lock = Lock()
         self.pulse_active = False
         self.start_time = None
+        self.progress_bus = ProgressBus.for_widget(root)
 
     def setup_variables(self):
         """Initialize compression variables."""
@@ -87,6 +90,17 @@ class CompressionOps:
             ttk.Radiobutton(self.compression_options_frame, text=text, variable=self.compression_level_var, value=value).pack(side="left", padx=5)
         ToolTip(self.compression_options_frame, "Compression intensity: High (smaller files), Low (faster)")
 
+        # Execution backend selector
+        self.backend_frame = ttk.Frame(self.compression_frame)
+        self.backend_frame.pack(pady=5)
+
+        self.backend_var = tk.StringVar(value="thread")
+        ttk.Label(self.backend_frame, text="Run with:", style='Normal.TLabel').pack(side="left", padx=5)
+
+        for text, value in [("Threads", "thread"), ("Processes", "process")]:
+            ttk.Radiobutton(self.backend_frame, text=text, variable=self.backend_var, value=value).pack(side="left", padx=5)
+        ToolTip(self.backend_frame, "Processes use all CPU cores for large batches; Threads start faster for a few files")
+
     def setup_batch_options(self):
         """Batch processing controls with improved validation."""
         settings = [
@@ -438,6 +452,7 @@ class CompressionOps:
         self.log_message("\nNEW OPERATION", "HEADER")
         self.log_message(f"Output directory: {output_dir}", "INFO")
         self.log_message(f"Compression level: {self.compression_level_var.get().title()}", "INFO")
+        self.log_message(f"Backend: {'Processes' if self.backend_var.get() == 'process' else 'Threads'}", "INFO")
         self.log_message(f"Batch Size: {self.batch_size_var.get()} files", "INFO")
         self.log_message(f"Pause Between Batches: {self.pause_duration_var.get()}s", "INFO")
         self.log_message(f"Minimum file size: {self.min_size_var.get():,} KB", "INFO")
@@ -472,16 +487,16 @@ class CompressionOps:
     # Modified compress_files method
     def compress_files(self):
         """
-        Process PDF files in batches with thread pooling.
+        Process PDF files in batches with a thread or process pool.
         
         Features:
-        - Dynamic batch sizing based on CPU cores
-        - Automatic retry for transient errors
+        - Selectable backend: threads, or worker processes for CPU-bound batches
+        - Worker processes are recycled to keep memory in check
         - Memory-optimized processing
         
         Flow:
         1. Validate all input files
-        2. Create worker threads
+        2. Create worker pool for the selected backend
         3. Checks for write permissions in output folders
         4. Process with configurable pauses
         5. Handle cleanup and reporting
@@ -491,21 +506,36 @@ class CompressionOps:
         stats = {"original": 0, "compressed": 0, "skipped": 0}
         results = []
 
-        with ThreadPoolExecutor(
-            max_workers=min(self.batch_size, os.cpu_count() * 2)            
-        ) as executor:
+        backend = self.backend_var.get()
+        level = self.compression_level_var.get()
+        delete_original = self.delete_original_var.get()
+        cpu_count = os.cpu_count() or 1
+        max_workers = min(self.batch_size, cpu_count if backend == "process" else cpu_count * 2)
+
+        # ETA weighted by file size: one large scan takes longer than many small letters
+        sizes = {}
+        for pdf_file in self.pdf_files:
+            try:
+                sizes[pdf_file] = os.path.getsize(pdf_file)
+            except OSError:
+                sizes[pdf_file] = 0
+        estimator = ThroughputEstimator(total_units=total_files, total_bytes=sum(sizes.values()), unit="files")
+
+        executor = create_executor(backend, max_workers=max_workers)
+        try:
+            # compress_pdf is submitted directly so it can be pickled for worker processes
             futures = {executor.submit(
-                self.process_single_file, 
+                compress_pdf, 
                 pdf_file, 
-                self.compression_level_var.get(),
-                self.delete_original_var.get(),
-                self.min_size_var.get()
+                self._build_output_path(pdf_file, delete_original),
+                level=level,
+                overwrite=delete_original
             ): pdf_file for pdf_file in self.pdf_files}
 
             completed = 0
             self.progress["maximum"] = total_files
-            self.root.after(0, self._update_progress, 0)
-            self.root.after(0, self._update_status, 0, total_files, 0)
+            self.progress_bus.post("compression_progress", self._update_progress, 0)
+            self.progress_bus.post("compression_status", self._update_status, 0, total_files, 0)
 
             for future in as_completed(futures):
                 if self.cancel_flag:
@@ -516,21 +546,21 @@ class CompressionOps:
                     completed += 1
                 remaining = total_files - completed
                 active = min(self.batch_size, remaining)
+                estimator.advance(1, sizes[pdf_file])
+                eta_seconds = estimator.eta_seconds()
+                eta = format_time(eta_seconds).strip() if eta_seconds is not None else "--:--"
 
                 # Update progress components
-                self.root.after(0, self._update_progress, completed)
-                self.root.after(0, self._update_status, completed, total_files, active)
+                self.progress_bus.post("compression_progress", self._update_progress, completed)
+                self.progress_bus.post("compression_status", self._update_status, completed, total_files, active,
+                                       eta, estimator.rate_text())
                 
                 # Store results without immediate UI updates
                 try:
-                    result = future.result()
+                    success, _, original, compressed = future.result()
+                    result = (success, original, compressed)
                     results.append((pdf_file, result))
-                    
-                    if not result:
-                        stats["skipped"] += 1
-                        continue
 
-                    success, original, compressed = result
                     if success:
                         stats["original"] += original
                         stats["compressed"] += compressed
@@ -541,14 +571,18 @@ class CompressionOps:
                         time.sleep(self.pause_duration)
 
                 except Exception as e:
+                    logging.error(f"Worker failed on {pdf_file}: {str(e)}")
                     stats["skipped"] += 1
                     results.append((pdf_file, None))
+        finally:
+            # Drop queued files on cancel instead of waiting for the whole batch
+            executor.shutdown(wait=not self.cancel_flag, cancel_futures=self.cancel_flag)
 
-            # Final UI updates after completion
-            self.root.after(0, self._show_final_results, results, stats)            
+        # Final UI updates after completion, behind any progress still queued
+        self.progress_bus.call(self._show_final_results, results, stats)            
 
-    def _update_status(self, completed: int, total: int, active: int):
-        """Enhanced status with active files"""
+    def _update_status(self, completed: int, total: int, active: int, eta: str = None, rate: str = None):
+        """Enhanced status with active files, ETA and throughput"""
         if total > 0:
             percent = f"({completed/total:.0%})"
         else:
@@ -556,6 +590,8 @@ class CompressionOps:
         
         status_text = (f"Processing {active} file{'s' if active != 1 else ''} "
                       f"| Completed: {completed}/{total} {percent}")
+        if eta:
+            status_text += f"\nETA: {eta} | {rate}"
         self.status_label.config(text=status_text)
 
     def _show_final_results(self, results, stats):
@@ -574,41 +610,19 @@ class CompressionOps:
         self.root.after(0, lambda: self.progress_percentage_label.config(text="0%"))
         self.progress["value"] = 0    
 
-    def process_single_file(self, pdf_file: str, level: str, delete_original: bool, min_size_kb: int):
-        """Process individual PDF file."""
-        try:
-            # Generate output path
-            if delete_original:
-                output_path = pdf_file
-            else:
-                # Use custom directory if specified
-                if self.custom_output_dir:
-                    filename = os.path.basename(pdf_file)
-                    base = os.path.splitext(filename)[0]
-                    output_path = os.path.join(self.custom_output_dir, f"{base}_compressed.pdf")
-                else:
-                    base = os.path.splitext(pdf_file)[0]
-                    output_path = f"{base}_compressed.pdf"
-
-            # Get all 4 return values
-            success, result, original_size, compressed_size = compress_pdf(
-                pdf_file,
-                output_path,
-                level=level,
-                overwrite=delete_original
-            )
+    def _build_output_path(self, pdf_file: str, delete_original: bool) -> str:
+        """Output path for a compressed file (the input itself when replacing originals)."""
+        if delete_original:
+            return pdf_file
 
-            # Convert KB to bytes if needed (ADD THIS)
-            original_bytes = original_size
-            compressed_bytes = compressed_size
+        # Use custom directory if specified
+        if self.custom_output_dir:
+            filename = os.path.basename(pdf_file)
+            base = os.path.splitext(filename)[0]
+            return os.path.join(self.custom_output_dir, f"{base}_compressed.pdf")
 
-            if success:
-                return True, original_bytes, compressed_bytes
-            else:
-                return False, original_bytes, compressed_bytes
-                
-        except Exception as e:
-            return False, 0, 0
+        base = os.path.splitext(pdf_file)[0]
+        return f"{base}_compressed.pdf"
 
     def cancel_compression(self):
         """Handle compression cancellation."""
@@ -629,8 +643,7 @@ class CompressionOps:
         with self.lock:
             self.progress["value"] = progress
             percentage = int((progress / self.progress["maximum"]) * 100)
-            self.root.after(0, self.progress_percentage_label.config, 
-                        {'text': f"{percentage}%"})
+            self.progress_percentage_label.config(text=f"{percentage}%")
 
     def _update_current_file(self, file_path: str, original: int, compressed: int):
         """Show formatted file compression results with aligned numbers"""
@@ -11,13 +11,16 @@ import sys
 
 # Local imports
 from logic.merging import merge_pdfs
+from logic.progress import ThroughputEstimator
+from .progress_bus import ProgressBus
 from .utils import ToolTip, CustomText
-from .utils import truncate_path, is_directory_writable
+from .utils import truncate_path, is_directory_writable, format_time
 
 
 class MergingOps:
     def __init__(self, root):
         self.root = root
+        self.progress_bus = ProgressBus.for_widget(root)
         self.setup_variables()
         self.font = ("Segoe UI", 10)
         self.log_lock = Lock()        
@@ -26,7 +29,9 @@ class MergingOps:
         """Initialize merging variables."""
         self.merge_files = []
         self.output_folder = ""
-        self.merged_file_path = None        
+        self.merged_file_path = None
+        self.estimator = None
+        self.bytes_before = []  # Bytes of all files ahead of each file in the merge order        
 
     def setup_merging_ui(self, parent):
         """Set up merging UI components."""
@@ -75,6 +80,15 @@ class MergingOps:
         self.compress_checkbox.pack(pady=5)
         ToolTip(self.compress_checkbox, "Compress PDFs before merging them")
 
+        self.compress_after_merge_var = tk.BooleanVar(value=False)
+        self.compress_after_checkbox = ttk.Checkbutton(
+            self.merging_frame,
+            text="Compress the merged file",
+            variable=self.compress_after_merge_var
+        )
+        self.compress_after_checkbox.pack(pady=5)
+        ToolTip(self.compress_after_checkbox, "Compress the merged PDF as a whole, keeping one copy of images and fonts repeated across the files")
+
         # Compression level radio buttons
         self.merge_compression_level_var = tk.StringVar(value="medium")
         self.compression_frame = ttk.Frame(self.merging_frame)
@@ -90,6 +104,35 @@ class MergingOps:
             rb.pack(side="left", padx=5)
             ToolTip(rb, "If the PDF has been previously compressed, further compression will yield minimal or no improvements.")
 
+        # Bookmarks
+        self.bookmark_files_var = tk.BooleanVar(value=False)
+        self.bookmark_files_checkbox = ttk.Checkbutton(
+            self.merging_frame,
+            text="Add a bookmark for each file",
+            variable=self.bookmark_files_var
+        )
+        self.bookmark_files_checkbox.pack(pady=5)
+        ToolTip(self.bookmark_files_checkbox, "Add a bookmark named after each file that jumps to its first page")
+
+        self.keep_outlines_var = tk.BooleanVar(value=True)
+        self.keep_outlines_checkbox = ttk.Checkbutton(
+            self.merging_frame,
+            text="Keep the files' own bookmarks",
+            variable=self.keep_outlines_var
+        )
+        self.keep_outlines_checkbox.pack(pady=5)
+        ToolTip(self.keep_outlines_checkbox, "Keep the bookmarks already in the files, nested under each file's bookmark if added")
+
+        # Merge engine
+        self.low_memory_merge_var = tk.BooleanVar(value=False)
+        self.low_memory_checkbox = ttk.Checkbutton(
+            self.merging_frame,
+            text="Low-memory merge (for very large batches)",
+            variable=self.low_memory_merge_var
+        )
+        self.low_memory_checkbox.pack(pady=5)
+        ToolTip(self.low_memory_checkbox, "Merge with pikepdf, keeping only part of the input in memory and spilling the rest to disk")
+
     def setup_delete_originals_lbl(self):        
         # Delete originals checkbox
         self.delete_after_merge_var = tk.BooleanVar(value=False)
@@ -305,21 +348,31 @@ class MergingOps:
                 output_file,
                 compress_before_merge=self.compress_before_merge_var.get(),
                 compression_level=self.merge_compression_level_var.get(),
-                update_callback=lambda f, p: self.root.after(0, self._update_progress, f, p),
-                log_callback=lambda msg: self.root.after(0, self.append_log, msg)
+                engine="pikepdf" if self.low_memory_merge_var.get() else "pypdf2",
+                compress_after_merge=self.compress_after_merge_var.get(),
+                bookmarks=self.bookmark_files_var.get(),
+                keep_outlines=self.keep_outlines_var.get(),
+                update_callback=self._on_merge_progress,
+                log_callback=lambda msg: self.progress_bus.call(self.append_log, msg)
             )
 
+            # Queued behind the last progress updates so they cannot overwrite the result
             if success:
-                self._handle_merge_success(output_file, summary)
+                self.progress_bus.call(self._handle_merge_success, output_file, summary)
                 if self.delete_after_merge_var.get():
-                    self._handle_file_deletion()
+                    self.progress_bus.call(self._handle_file_deletion)
             else:
-                self._handle_merge_error(error)
-                
+                self.progress_bus.call(self._handle_merge_error, error)
+
         except Exception as e:
-            self._handle_critical_error(e)
+            self.progress_bus.call(self._handle_critical_error, e)
         finally:
-            self._reset_ui_state()
+            self.progress_bus.call(self._reset_ui_state)
+
+    def _on_merge_progress(self, current_file, progress, stage):
+        """Worker side: called from the merge thread and, for "compressed", from pool threads"""
+        # One key per stage: each carries a running count, so only its latest post matters
+        self.progress_bus.post(("merge_progress", stage), self._update_progress, current_file, progress, stage)
 
     # --------------------- Helper Methods for Merging---------------------
     def _update_selected_count(self, count):
@@ -396,20 +449,44 @@ class MergingOps:
         self.merged_file_path = output_file
         self.start_merge_button.config(state=tk.DISABLED)
         self.merge_progress["value"] = 0
+        self.compressed_count = 0
+        self.appended_count = 0
 
-    def _update_progress(self, current_file, progress):
-        """Update progress indicators."""
-        filename = os.path.basename(current_file)
-        if len(filename) >= 30:
-            filename = f"{filename[:27]}..."
-
-        self.merge_status_label.config(text=f"Processing: {filename}")
-        self.merge_progress["value"] = progress
-        percentage = int((progress / len(self.merge_files)) * 100)
+        # Size-weighted ETA: the merge time of a file grows with its size
+        self.bytes_before = [0]
+        for path in self.merge_files:
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                size = 0
+            self.bytes_before.append(self.bytes_before[-1] + size)
+        self.estimator = ThroughputEstimator(total_units=len(self.merge_files),
+                                             total_bytes=self.bytes_before[-1], unit="files")
+
+    def _update_progress(self, current_file, progress, stage="appended"):
+        """Update progress indicators for a file compressed or appended."""
+        if stage == "compressed":
+            # Files are compressed ahead of the merge, in whatever order they finish
+            # Pool threads can post their counts out of order
+            self.compressed_count = max(self.compressed_count, progress)
+        else:
+            self.appended_count = progress
+
+        self.merge_progress["value"] = self.appended_count
+        percentage = int((self.appended_count / len(self.merge_files)) * 100)
         self.progress_percentage_label.config(text=f"{percentage}%")
-        self.merge_status_label.config(
-            text=f"Merging file {progress} of {len(self.merge_files)}"
-        )
+        status_text = f"Merged {self.appended_count} of {len(self.merge_files)} files"
+        if self.compress_before_merge_var.get():
+            status_text += f" | Compressed {self.compressed_count}"
+
+        # Size-weighted ETA over the files merged so far
+        if self.estimator is not None and self.appended_count < len(self.bytes_before):
+            self.estimator.update(self.appended_count, self.bytes_before[self.appended_count])
+            eta_seconds = self.estimator.eta_seconds()
+            if eta_seconds is not None:
+                status_text += f"\nETA: {format_time(eta_seconds).strip()} | {self.estimator.rate_text()}"
+
+        self.merge_status_label.config(text=status_text)
 
     def _handle_merge_success(self, output_file, summary_data):
         """Handle successful merge with clean formatting."""        
@@ -432,6 +509,8 @@ class MergingOps:
             f"💾 Output File: {truncate_path(output_file)}",
             f"📦 Total Size: {format_size(summary_data['total_original'])}"
         ]
+        if summary_data.get('peak_rss_bytes'):
+            summary_content.append(f"🧠 Peak Memory: {format_size(summary_data['peak_rss_bytes'])}")
 
         # Add compression results if used
         if summary_data['used_compression']:
@@ -449,6 +528,17 @@ class MergingOps:
                 f"   Space Saved: {format_size(saved)} (▼{ratio_display:.1f}%)"
             ])                   
 
+        post_merge = summary_data.get('post_merge')
+        if post_merge:
+            saved = max(post_merge['original_size'] - post_merge['optimized_size'], 0)
+            ratio = (saved / post_merge['original_size'] * 100) if post_merge['original_size'] > 0 else 0
+            summary_content.extend([
+                f"\n🗜️ Merged File Compression:",
+                f"   Before: {format_size(post_merge['original_size'])}",
+                f"   After: {format_size(post_merge['optimized_size'])} (▼{ratio:.1f}%)",
+                f"   Duplicates Removed: {post_merge['duplicate_objects']} ({format_size(post_merge['dedup_bytes_saved'])})"
+            ])
+
         # Add to log
         for line in summary_content:
             self.append_log(line)
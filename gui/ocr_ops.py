@@ -11,11 +11,16 @@ import subprocess
 import time
 import datetime
 import ctypes
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from gui.utils import ToolTip, CustomText
-from logic.ocr import ocr_pdf
+from logic.ocr import ocr_pdf, create_page_executor, OCR_ENGINES, OCR_COLORSPACES, OCR_OUTPUT_FORMATS
+from logic.ocr_cache import OCRCache
+from logic.ocr_checkpoint import CHECKPOINT_SUFFIX
+from logic.progress import ThroughputEstimator
 from .utils import is_directory_writable, truncate_filename
 from .print_manager import PrintManager 
+from .progress_bus import ProgressBus
 
 class OCROpsFrame(ttk.Frame):
     def __init__(self, parent, controller):
@@ -28,8 +33,6 @@ class OCROpsFrame(ttk.Frame):
         self.output_dir = None  # Variable for custom output directory
         self.alternative_dir_for_all = None 
         self.page_progress_tag = "page_progress"
-        self.current_progress_start = None
-        self.current_progress_end = None
         self.ocr_thread = None
         self.cancelled = False
         self.currently_processing = False 
@@ -40,20 +43,20 @@ class OCROpsFrame(ttk.Frame):
         # Pause state variables
         self.pause_event = threading.Event()
         self.resume_event = threading.Event()
+
+        # Files being OCRed right now, by their position in the batch
+        self.active_jobs = {}
+        self.jobs_lock = threading.Lock()
         self.paused_state = {
             'current_file': None,
             'current_page': 0,
             'remaining_files': []
         }
 
-        # ETA variables
-        self.processing_timers = {
-            'start_time': None,
-            'total_paused_duration': 0.0,
-            'pause_start_time': None,
-            'current_file_start': None,
-            'current_file_paused': 0.0
-        }
+        # ETA: pages/sec and MB/sec across the batch (per-file estimators live in the jobs)
+        self.batch_estimator = ThroughputEstimator(unit="pages")
+        # Page progress from worker threads, redrawn at a fixed rate
+        self.progress_bus = ProgressBus.for_widget(self)
 
     def setup_variables(self):
         """Initialize OCR variables."""
@@ -114,9 +117,83 @@ class OCROpsFrame(ttk.Frame):
         self.format_var = tk.StringVar(value="docx")
         ttk.Label(lang_frame, text="Format:").pack(side="left", padx=5)
         format_combo = ttk.Combobox(lang_frame, textvariable=self.format_var,
-                                values=["docx", "rtf"], width=5)
+                                values=list(OCR_OUTPUT_FORMATS), width=5)
         format_combo.pack(side="left", padx=5)        
-        ToolTip(format_combo, "Output file format", delay=500)
+        ToolTip(format_combo, "Output file format (pdf = searchable copy of the original)", delay=500)
+
+        # Page-level parallelism
+        workers_frame = ttk.Frame(self.ocr_frame)
+        workers_frame.pack(pady=5)
+
+        self.workers_var = tk.IntVar(value=1)
+        ttk.Label(workers_frame, text="Page workers:").pack(side="left", padx=5)
+        workers_spin = ttk.Spinbox(workers_frame, from_=1, to=os.cpu_count() or 1,
+                                   textvariable=self.workers_var, width=4, state="readonly")
+        workers_spin.pack(side="left", padx=5)
+        ToolTip(workers_spin, "Number of pages recognized in parallel across all files (one process per worker)", delay=500)
+
+        self.files_var = tk.IntVar(value=1)
+        ttk.Label(workers_frame, text="Files at once:").pack(side="left", padx=5)
+        files_spin = ttk.Spinbox(workers_frame, from_=1, to=8,
+                                 textvariable=self.files_var, width=4, state="readonly")
+        files_spin.pack(side="left", padx=5)
+        ToolTip(files_spin, "Number of documents OCRed at the same time; they share the page workers", delay=500)
+
+        self.engine_var = tk.StringVar(value="auto")
+        ttk.Label(workers_frame, text="Engine:").pack(side="left", padx=5)
+        engine_combo = ttk.Combobox(workers_frame, textvariable=self.engine_var,
+                                    values=list(OCR_ENGINES), width=10, state="readonly")
+        engine_combo.pack(side="left", padx=5)
+        ToolTip(engine_combo, "auto: keep Tesseract loaded via tesserocr when installed, else pytesseract", delay=500)
+
+        self.setup_ocr_render_options()
+
+    def setup_ocr_render_options(self):
+        """Rasterization settings: resolution, colorspace and preprocessing."""
+        render_frame = ttk.Frame(self.ocr_frame)
+        render_frame.pack(pady=5)
+
+        self.dpi_var = tk.IntVar(value=300)
+        ttk.Label(render_frame, text="DPI:").pack(side="left", padx=5)
+        dpi_combo = ttk.Combobox(render_frame, textvariable=self.dpi_var,
+                                 values=[72, 150, 200, 300, 400], width=4, state="readonly")
+        dpi_combo.pack(side="left", padx=5)
+        ToolTip(dpi_combo, "Render resolution. 300 DPI gives the best accuracy, 72 DPI is fastest", delay=500)
+
+        self.colorspace_var = tk.StringVar(value="gray")
+        ttk.Label(render_frame, text="Color:").pack(side="left", padx=5)
+        color_combo = ttk.Combobox(render_frame, textvariable=self.colorspace_var,
+                                   values=list(OCR_COLORSPACES), width=5, state="readonly")
+        color_combo.pack(side="left", padx=5)
+        ToolTip(color_combo, "Gray uses a third of the memory of RGB and is all Tesseract needs", delay=500)
+
+        preprocess_frame = ttk.Frame(self.ocr_frame)
+        preprocess_frame.pack(pady=0)
+
+        self.binarize_var = tk.BooleanVar(value=False)
+        binarize_cb = ttk.Checkbutton(preprocess_frame, text="Binarize", variable=self.binarize_var)
+        binarize_cb.pack(side="left", padx=5)
+        ToolTip(binarize_cb, "Convert pages to black and white before OCR (helps with noisy scans)", delay=500)
+
+        self.deskew_var = tk.BooleanVar(value=False)
+        deskew_cb = ttk.Checkbutton(preprocess_frame, text="Deskew", variable=self.deskew_var)
+        deskew_cb.pack(side="left", padx=5)
+        ToolTip(deskew_cb, "Straighten slightly rotated scans before OCR", delay=500)
+
+        self.text_layer_var = tk.BooleanVar(value=True)
+        text_layer_cb = ttk.Checkbutton(preprocess_frame, text="Use existing text", variable=self.text_layer_var)
+        text_layer_cb.pack(side="left", padx=5)
+        ToolTip(text_layer_cb, "Copy pages that already have selectable text instead of OCRing them", delay=500)
+
+        self.cache_var = tk.BooleanVar(value=True)
+        cache_cb = ttk.Checkbutton(preprocess_frame, text="Cache", variable=self.cache_var)
+        cache_cb.pack(side="left", padx=5)
+        ToolTip(cache_cb, "Reuse OCR results for pages recognized before with the same settings", delay=500)
+
+        self.resume_var = tk.BooleanVar(value=True)
+        resume_cb = ttk.Checkbutton(preprocess_frame, text="Resume", variable=self.resume_var)
+        resume_cb.pack(side="left", padx=5)
+        ToolTip(resume_cb, "Checkpoint every page; a rerun continues interrupted files and skips finished ones", delay=500)
 
     def setup_output_directory_selector(self):
         """Add output directory selection components."""
@@ -395,10 +472,12 @@ class OCROpsFrame(ttk.Frame):
         for pdf_path in self.file_paths:
             # Determine correct output directory
             output_dir = self.output_dir or os.path.dirname(pdf_path)
-            output_filename = f"OCR_{os.path.splitext(os.path.basename(pdf_path))[0]}.docx"
+            output_filename = f"OCR_{os.path.splitext(os.path.basename(pdf_path))[0]}.{self.format_var.get()}"
             output_path = os.path.join(output_dir, output_filename)
             
-            if os.path.exists(output_path):
+            # Partial outputs of interrupted jobs are continued, not overwritten
+            resumable = self.resume_var.get() and os.path.exists(output_path + CHECKPOINT_SUFFIX)
+            if os.path.exists(output_path) and not resumable:
                 existing_files.append(output_path)
 
         if existing_files:
@@ -420,32 +499,45 @@ class OCROpsFrame(ttk.Frame):
 
     # ---------------------------- Functionality Methods -------------------------------
     # ETA Functions    
-    def get_elapsed_time(self):
-        """Get actual processing time excluding paused periods"""
-        if not self.processing_timers['start_time']:
-            return 0.0
-        total_elapsed = time.time() - self.processing_timers['start_time']
-        return total_elapsed - self.processing_timers['total_paused_duration']
-
     def format_etr(self, seconds):
         """Convert seconds to human-readable time format"""
-        if seconds < 0:
+        if seconds is None or seconds < 0:
             return ""
         minutes, seconds = divmod(int(seconds), 60)
         hours, minutes = divmod(minutes, 60)
         return f"{hours:02d}h {minutes:02d}m {seconds:02d}s"
 
-    def calculate_etr(self, processed_items, total_items, elapsed_time):
-        """Safer ETR calculation with zero checks"""
-        if processed_items <= 0 or elapsed_time <= 0 or total_items <= 0:
-            return ""
-        
-        try:
-            items_remaining = total_items - processed_items
-            time_per_item = elapsed_time / processed_items
-            return self.format_etr(time_per_item * items_remaining)
-        except ZeroDivisionError:
-            return "--:--"
+    def _track_job_progress(self, job, current_page, total_pages):
+        """Feed a file's page progress to its own and the batch estimator (pages and input bytes)."""
+        with self.jobs_lock:
+            if job['pages_done'] is None:
+                # First report: pages restored from a checkpoint are not throughput
+                job['pages_done'] = current_page
+                job['pages_total'] = total_pages
+                job['estimator'].total_units = total_pages - current_page
+                job['pages_base'] = current_page
+                self.batch_pages_known += total_pages - current_page
+                self.batch_bytes_known += job['size']
+                self.batch_bytes_pending -= job['size']
+                self._update_batch_total()
+                return
+            pages = current_page - job['pages_done']
+            job['pages_done'] = current_page
+            # Input read, for the MB/s readout: the file's size spread over its pages.
+            # The batch has no byte total, so its ETA stays on pages
+            nbytes = pages * job['size'] / total_pages if total_pages else 0
+        job['estimator'].update(units_done=current_page - job['pages_base'])
+        self.batch_estimator.advance(pages, nbytes)
+
+    def _update_batch_total(self):
+        """
+        Batch ETA total: the pages of files opened so far, plus the pages
+        of the files still queued estimated from their size at the pages
+        per byte seen so far. Called with jobs_lock held.
+        """
+        pages_per_byte = self.batch_pages_known / self.batch_bytes_known if self.batch_bytes_known else 0
+        self.batch_estimator.total_units = (self.batch_pages_known - self.batch_pages_dropped
+                                            + self.batch_bytes_pending * pages_per_byte)
     
     # Pause/Resume and Cancel OCR Functions
         
@@ -453,20 +545,29 @@ class OCROpsFrame(ttk.Frame):
         """Toggle between pause and resume states."""
         if self.pause_event.is_set():
             # Resume the processing
-            pause_duration = time.time() - self.processing_timers['pause_start_time']
-            self.processing_timers['total_paused_duration'] += pause_duration
-            self.processing_timers['current_file_paused'] += pause_duration
+            self._set_estimators_paused(False)
             self.pause_event.clear()
             self.resume_event.set()
             self.pause_resume_button.config(text="⏸ Pause")
             self.update_message("Resuming OCR process...", "success")
         else:
             # Pause the processing
-            self.processing_timers['pause_start_time'] = time.time()
+            self._set_estimators_paused(True)
+            self.resume_event.clear()
             self.pause_event.set()
             self.pause_resume_button.config(text="▶ Resume")
             self.update_message("Pausing OCR process after current page...", "warning")
         
+    def _set_estimators_paused(self, paused):
+        """Keep paused time out of the throughput and ETA figures."""
+        with self.jobs_lock:
+            estimators = [self.batch_estimator] + [job['estimator'] for job in self.active_jobs.values()]
+        for estimator in estimators:
+            if paused:
+                estimator.pause()
+            else:
+                estimator.resume()
+
     def cancel_ocr(self):
         """Handle OCR cancellation request"""
         if self.currently_processing:
@@ -687,14 +788,6 @@ class OCROpsFrame(ttk.Frame):
         self.after(0, lambda: self.total_progress_text.config(
             text="Total Progress: 0% | ETA:"
         ))
-        self.processing_timers = {
-            'start_time': time.time(),
-            'total_paused_duration': 0.0,
-            'pause_start_time': None,
-            'current_file_start': None,
-            'current_file_paused': 0.0
-        }
-
         self.currently_processing = True
         self.cancelled = False  # Reset cancellation flag
         self.after(0, self.pause_resume_button.config, {'state': 'normal'})  # Enable pause button
@@ -704,71 +797,69 @@ class OCROpsFrame(ttk.Frame):
         processed_count = 0
         skipped_files = []
         permission_errors = []  # List for permission-related skips        
+        page_stats = {'pages_total': 0, 'pages_text_layer': 0, 'pages_cached': 0}  # Totals across files
+        cache = None
+        page_pool = None
+        file_pool = None
+        with self.jobs_lock:
+            self.active_jobs = {}
 
         # Initialize progress bars
         self.after(0, self.per_file_progress_bar.config, {"maximum": 100, "value": 0})
         self.after(0, self.total_progress_bar.config, {"maximum": total_files, "value": 0})
 
         try:
-            for index, pdf_path in enumerate(file_paths):
-                if self.cancelled:
-                    self.after(0, self.update_message, 
-                              "⏹ Processing cancelled by user", "warning")
-                    break
-
-                # Reset progress positions for new file
-                self.current_progress_start = None
-                self.current_progress_end = None
-                
-                # Show file header
-                filename = os.path.basename(pdf_path)
-                display_name = truncate_filename(filename, "...", 40)
-                self.after(0, self.update_file_header, index+1, len(file_paths), display_name)
-
-                # Determine output path
-                output_dir = self.output_dir or os.path.dirname(pdf_path)
-
-                # Check if we have a custom directory for this file
-                if self.alternative_dir_for_all is not None:
-                    output_dir = self.alternative_dir_for_all
-                else:
-                    # Check directory writability
-                    writable, error_msg = is_directory_writable(output_dir)
-                    if not writable:
-                        response = self.prompt_alternative_directory(pdf_path, error_msg)
-                        if response is None:  # User canceled
-                            break
-                        if response:  # User provided new directory
-                            output_dir = response
-                            self.alternative_dir_for_all = output_dir  # Apply to all subsequent
-                        else:  # User chose to skip # Skip
-                            permission_errors.append(pdf_path)
-                            self.after(0, self.update_message, 
-                                     f"⚠️ Skipped {filename}: {error_msg}", "error")
-                            continue
-
-                output_filename = f"OCR_{os.path.splitext(os.path.basename(pdf_path))[0]}.docx"
-                output_path = os.path.join(output_dir, output_filename)
-
-                # Skip existing files if not overwriting
-                if not self.overwrite_files and os.path.exists(output_path):
-                    skipped_files.append(output_path)
+            if self.cache_var.get():
+                try:
+                    cache = OCRCache()
+                except Exception as e:
+                    self.after(0, self.update_message, f"⚠️ OCR cache unavailable: {str(e)}", "warning")
+
+            # Output folders are resolved before any file starts, so dialogs never
+            # come up while several files are running
+            jobs = self._plan_ocr_jobs(file_paths, skipped_files, permission_errors)
+
+            # The batch ETA counts pages; queued files are estimated from their size until they open
+            self.batch_estimator = ThroughputEstimator(unit="pages")
+            self.batch_pages_known = 0
+            self.batch_pages_dropped = 0
+            self.batch_bytes_known = 0
+            self.batch_bytes_pending = sum(job['size'] for job in jobs)
+
+            # Several files run at once and share one pool of page workers; their
+            # threads take turns on PyMuPDF (FITZ_LOCK), the OCR itself runs in parallel
+            max_files = max(1, self.files_var.get())
+            page_workers = max(1, self.workers_var.get())
+            if page_workers > 1 or max_files > 1:
+                page_pool = create_page_executor(page_workers)
+            file_pool = ThreadPoolExecutor(max_workers=max_files, thread_name_prefix="ocr-file")
+            futures = {file_pool.submit(self._ocr_file_job, job, cache, page_pool): job for job in jobs}
+
+            for future in as_completed(futures):
+                job = futures[future]
+                filename = job['filename']
+                try:
+                    final_path, file_stats = future.result()
+                except Exception as e:
+                    if not (self.cancelled or "cancelled" in str(e).lower()):
+                        self.after(0, self.update_message, f"Error: {filename}: {str(e)}", "error")
                     continue
+                finally:
+                    self.progress_bus.call(self._clear_progress_line, job)
+                    # Pages a failed or already finished file never got through are no longer outstanding
+                    with self.jobs_lock:
+                        if job['pages_done'] is None:
+                            self.batch_bytes_pending -= job['size']
+                        else:
+                            self.batch_pages_dropped += job['pages_total'] - job['pages_done']
+                            job['pages_done'] = job['pages_total']
+                        self._update_batch_total()
 
-                # Process file with the determined output directory and cancellation support
-                language = self.lang_var.get()
-                output_format = self.format_var.get()  # Get selected format
-                final_path = ocr_pdf(
-                    pdf_path,
-                    output_dir,
-                    language,
-                    lambda curr, total, name=filename: self.update_progress(curr, total, name) or (self.cancelled and 
-                    self._handle_cancellation_during_processing(name)),
-                    output_format  # Pass format to OCR function
-                )
                 self.ocr_output_files.append(final_path)  # Track output file
                 
                 processed_count += 1
+                for key in page_stats:
+                    page_stats[key] += file_stats.get(key, 0)
                 self.after(0, self.update_total_progress, processed_count, total_files)
 
                 # After successful processing
@@ -776,25 +867,36 @@ class OCROpsFrame(ttk.Frame):
                     f"Completed: {truncate_filename(filename, '...', 40)}\n"
                     f"📁 Saved to: {os.path.dirname(final_path)}"                    
                 )
+                if file_stats.get('already_complete'):
+                    completion_text += "\n✔ Already completed in an earlier run"
+                if file_stats.get('pages_resumed'):
+                    completion_text += (f"\n⏯ Resumed after page {file_stats['pages_resumed']}"
+                                        f"/{file_stats['pages_total']}")
+                if file_stats.get('pages_text_layer'):
+                    completion_text += (f"\n📄 Text layer reused: {file_stats['pages_text_layer']}"
+                                        f"/{file_stats['pages_total']} pages")
+                if file_stats.get('pages_cached'):
+                    completion_text += (f"\n♻ From cache: {file_stats['pages_cached']}"
+                                        f"/{file_stats['pages_total']} pages")
+                if file_stats.get('recovered_path'):
+                    completion_text += (f"\n🩹 Interrupted earlier run saved as "
+                                        f"{os.path.basename(file_stats['recovered_path'])}")
                 self.after(0, self._update_message_internal, completion_text, "success")
 
-                # Clear progress line positions
-                self.current_progress_start = None
-                self.current_progress_end = None
-
-        except RuntimeError as e:
-            if "cancelled" in str(e).lower():
-                self.after(0, self.update_message, f"⏹ {str(e)}", "warning")
-            else:
-                raise
+            if self.cancelled:
+                self.after(0, self.update_message, "⏹ Processing cancelled by user", "warning")
 
         except Exception as e:
-            if "cancelled" in str(e).lower():
-                self.after(0, self.update_message, 
-                          f"⏹ {str(e)}", "warning")
             self.after(0, self.update_message, f"Error: {str(e)}", "error")
 
         finally:
+            # Files still queued are dropped; running ones stop at their next page after a cancel
+            if file_pool:
+                file_pool.shutdown(wait=True, cancel_futures=True)
+            if page_pool:
+                page_pool.shutdown(wait=True, cancel_futures=True)
+            if cache:
+                cache.close()
             was_cancelled = self.finalize_ocr_cleanup()
             elapsed = datetime.timedelta(seconds=int(time.time()-start_time))
             
@@ -810,6 +912,8 @@ class OCROpsFrame(ttk.Frame):
                     f"Processed {processed_count}/{total_files} files\n"
                     f"Skipped {len(skipped_files)} existing files\n"
                     f"Skipped {len(permission_errors)} files due to permission issues\n"
+                    f"Pages from text layer (OCR skipped): {page_stats['pages_text_layer']}/{page_stats['pages_total']}\n"
+                    f"Pages from cache: {page_stats['pages_cached']}/{page_stats['pages_total']}\n"
                     f"Time elapsed: {elapsed}")
 
             # Common cleanup
@@ -826,17 +930,112 @@ class OCROpsFrame(ttk.Frame):
                 self.print_button.config(state="normal", style='Ready.TButton')
                 self.open_folder_btn.config(state="normal", style='Ready.TButton')
 
-            # Reset progress bars and labels
-            self.per_file_progress_bar["value"] = 0
-            self.total_progress_bar["value"] = 0
-            self.per_file_progress_text.config(text=f"All done")
-            self.total_progress_text.config(text=f"All done")
-            self.per_file_percentage_label.config(text="0%", style = "")
-            self.total_percentage_label.config(text="0%", style = "")
-            
-            self.selected_files_label.config(
-                text=f"{processed_count} PDFs processed. Select new files to continue.")
-            
+            # Reset progress bars and labels once the last page updates are drawn
+            self.progress_bus.call(self._reset_progress_display, processed_count)
+
+    def _reset_progress_display(self, processed_count):
+        self.per_file_progress_bar["value"] = 0
+        self.total_progress_bar["value"] = 0
+        self.per_file_progress_text.config(text=f"All done")
+        self.total_progress_text.config(text=f"All done")
+        self.per_file_percentage_label.config(text="0%", style = "")
+        self.total_percentage_label.config(text="0%", style = "")
+        
+        self.selected_files_label.config(
+            text=f"{processed_count} PDFs processed. Select new files to continue.")
+
+    def _plan_ocr_jobs(self, file_paths, skipped_files, permission_errors):
+        """Resolve the output folder of every file and drop the ones to skip."""
+        jobs = []
+        output_format = self.format_var.get()
+        for index, pdf_path in enumerate(file_paths):
+            filename = os.path.basename(pdf_path)
+
+            # Determine output path
+            output_dir = self.output_dir or os.path.dirname(pdf_path)
+
+            # Check if we have a custom directory for this file
+            if self.alternative_dir_for_all is not None:
+                output_dir = self.alternative_dir_for_all
+            else:
+                # Check directory writability
+                writable, error_msg = is_directory_writable(output_dir)
+                if not writable:
+                    response = self.prompt_alternative_directory(pdf_path, error_msg)
+                    if response is None:  # User canceled
+                        break
+                    if response:  # User provided new directory
+                        output_dir = response
+                        self.alternative_dir_for_all = output_dir  # Apply to all subsequent
+                    else:  # User chose to skip # Skip
+                        permission_errors.append(pdf_path)
+                        self.after(0, self.update_message, 
+                                 f"⚠️ Skipped {filename}: {error_msg}", "error")
+                        continue
+
+            output_filename = f"OCR_{os.path.splitext(filename)[0]}.{output_format}"
+            output_path = os.path.join(output_dir, output_filename)
+
+            # Skip existing files if not overwriting (unless continuing an interrupted job)
+            resumable = self.resume_var.get() and os.path.exists(output_path + CHECKPOINT_SUFFIX)
+            if not self.overwrite_files and os.path.exists(output_path) and not resumable:
+                skipped_files.append(output_path)
+                continue
+
+            jobs.append({
+                'index': index + 1,
+                'total': len(file_paths),
+                'path': pdf_path,
+                'filename': filename,
+                'display_name': truncate_filename(filename, "...", 40),
+                'output_dir': output_dir,
+                'size': os.path.getsize(pdf_path),
+                # Overwriting means starting over; a finished job would otherwise be kept as it is
+                'resume': self.resume_var.get() and (resumable or not self.overwrite_files),
+                'pages_done': None,
+                'pages_total': None,
+                'estimator': ThroughputEstimator(unit="pages")
+            })
+        return jobs
+
+    def _ocr_file_job(self, job, cache, page_pool):
+        """OCR one file of the batch (runs on a file scheduler thread)."""
+        filename = job['filename']
+        if self.cancelled:
+            raise RuntimeError(f"Processing of {filename} cancelled by user")
+
+        job['estimator'].reset()  # Its clock starts now, not when the batch was planned
+        with self.jobs_lock:
+            self.active_jobs[job['index']] = job
+        self.progress_bus.call(self.update_file_header, job)
+
+        try:
+            # Process file with the determined output directory and cancellation support
+            file_stats = {}
+            final_path = ocr_pdf(
+                job['path'],
+                job['output_dir'],
+                self.lang_var.get(),
+                lambda curr, total: self.update_progress(curr, total, job) or (self.cancelled and
+                self._handle_cancellation_during_processing(filename)),
+                self.format_var.get(),  # Pass format to OCR function
+                workers=self.workers_var.get(),
+                engine=self.engine_var.get(),
+                dpi=self.dpi_var.get(),
+                colorspace=self.colorspace_var.get(),
+                binarize=self.binarize_var.get(),
+                deskew=self.deskew_var.get(),
+                use_text_layer=self.text_layer_var.get(),
+                stats=file_stats,
+                cache=cache,
+                resume=job['resume'],
+                executor=page_pool
+            )
+        finally:
+            with self.jobs_lock:
+                self.active_jobs.pop(job['index'], None)
+        return final_path, file_stats
+
     def _handle_cancellation_during_processing(self, filename):
         """Handle cancellation requests during active OCR processing"""
         self.cancelled = True
@@ -918,21 +1117,22 @@ class OCROpsFrame(ttk.Frame):
             warning_text += f"\n...and {len(skipped_files)-5} more"
         self._update_message_with_tag(warning_text + "\n", "warning")    
 
-    def update_file_header(self, current_file: int, total_files: int, display_name: str):
-        self.processing_timers['current_file_start'] = time.time()
-        self.processing_timers['current_file_paused'] = 0.0
-
-        self.selected_files_label.config(text=f"Progress: {current_file}/{total_files}: {display_name}")
-        """Update file processing header and initialize progress line"""
-        header_text = f"\n{current_file}/{total_files} {display_name}"
+    def update_file_header(self, job):
+        """Update file processing header and initialize the file's progress line"""
+        self.selected_files_label.config(text=f"Progress: {job['index']}/{job['total']}: {job['display_name']}")
+        header_text = f"\n{job['index']}/{job['total']} {job['display_name']}"
         self._update_message_internal(header_text, "file_header")
         
-        # Initialize progress line position
+        # Marks keep the progress line addressable while other files add text below it
+        mark = f"ocr_progress_{job['index']}"
         self.message_text.config(state="normal")
-        self.current_progress_start = self.message_text.index("end-1c")
+        self.message_text.mark_set(mark, "end-1c")
+        self.message_text.mark_gravity(mark, "left")
         self.message_text.insert("end", "\n", "progress")  # Empty line placeholder
-        self.current_progress_end = self.message_text.index("end-1c")
+        self.message_text.mark_set(f"{mark}_end", "end-1c")
+        self.message_text.mark_gravity(f"{mark}_end", "left")
         self.message_text.config(state="disabled")
+        job['mark'] = mark
 
     def show_overwrite_warning(self, existing_files):
         """Custom dialog with renamed buttons"""
@@ -970,72 +1170,76 @@ class OCROpsFrame(ttk.Frame):
         return response
 
     # Updated update_progress with ETR
-    def update_progress(self, current_page: int, total_pages: int, current_file: str):
+    def update_progress(self, current_page: int, total_pages: int, job: dict):
         """Update progress display with ETR calculations"""
+        current_file = job['filename']
         # Calculate percentages and ETRs first
         percent = int((current_page / total_pages) * 100) if total_pages > 0 else 0
-        file_elapsed = time.time() - self.processing_timers['current_file_start'] - self.processing_timers['current_file_paused']
+        self._track_job_progress(job, current_page, total_pages)
 
-        file_etr = self.calculate_etr(current_page, total_pages, file_elapsed)
-        
-        # Calculate total ETR
-        total_processed = self.total_progress_bar['value']
-        total_files = self.total_progress_bar['maximum']
-        total_elapsed = self.get_elapsed_time()
-        total_etr = self.calculate_etr(total_processed, total_files, total_elapsed)
-        #total_percent = int((total_processed / total_files) * 100) if total_files > 0 else 0        
-
-        # Update labels with captured values        
-        self.after(0, lambda fe=file_etr: self.per_file_progress_text.config(
-            text=f"{truncate_filename(current_file, '...', 30) } | ETR: {fe}"))
-        self.after(0, lambda p=percent: self.per_file_percentage_label.config(style='Orange.TLabel', text=f"{p}%"))        
-        
-        # Update total progress text
-        #total_percent = int((self.total_progress_bar['value']/self.total_progress_bar['maximum'])*100)
-        self.after(0, lambda te=total_etr: self.total_progress_text.config(style='Blue.TLabel',
-        text=f"Total Progress | ETA: {te}"))
-        
+        file_etr = self.format_etr(job['estimator'].eta_seconds())
+        total_etr = self.format_etr(self.batch_estimator.eta_seconds())
+        rate = self.batch_estimator.rate_text()
+
+        # The per-file bar follows the earliest file still running
+        with self.jobs_lock:
+            tracked = job['index'] == min(self.active_jobs, default=job['index'])
+
+        # Keyed posts: only the latest state of each widget is drawn per frame
+        if tracked:
+            self.progress_bus.post("ocr_file_progress", self._update_file_progress,
+                                   f"{truncate_filename(current_file, '...', 30) } | ETR: {file_etr}", percent)
+
+        self.progress_bus.post("ocr_total_text", self.total_progress_text.config,
+                               {'style': 'Blue.TLabel', 'text': f"Total Progress | ETA: {total_etr} | {rate}"})
         
         # Update progress text
-        percent = int((current_page / total_pages) * 100) if total_pages > 0 else 0
         progress_text = (f"Page {current_page}/{total_pages} ({percent}%) - {truncate_filename(current_file, '...', 40)}\n"
-                        f"File ETR: {file_etr} | Total ETR: {total_etr}")        
-        
-        # Update progress bar and text
-        self.after(0, lambda: self.per_file_progress_bar.configure(value=percent))        
+                        f"File ETR: {file_etr} | Total ETR: {total_etr} | {rate}")        
         
         # Update progress line in text area
-        self.after(0, self._update_progress_text, progress_text)
+        self.progress_bus.post(("ocr_progress_line", job['index']), self._update_progress_text, job, progress_text)
         
-        # Check for pause request
-        if self.pause_event.is_set():
-            self.after(0, self.update_message, "⏸ Processing paused. Click Resume to continue...", "warning")
-            self.resume_event.wait()
-            self.resume_event.clear()
-            self.pause_event.clear()
+        # Check for pause request; every running file waits here until resumed or cancelled
+        if self.pause_event.is_set() and not self.cancelled:
+            self.after(0, self.update_message,
+                       f"⏸ Paused: {truncate_filename(current_file, '...', 40)}. Click Resume to continue...", "warning")
+            while self.pause_event.is_set() and not self.cancelled:
+                self.resume_event.wait(0.5)
             self.after(0, self.update_message, "▶ Processing resumed...", "success")
         
-    def _update_progress_text(self, progress_text):
-        """Replace progress line text"""
-        if not self.current_progress_start or not self.current_progress_end:
+    def _update_file_progress(self, text, percent):
+        """Per-file label, percentage and bar"""
+        self.per_file_progress_text.config(text=text)
+        self.per_file_percentage_label.config(style='Orange.TLabel', text=f"{percent}%")
+        self.per_file_progress_bar.configure(value=percent)
+
+    def _update_progress_text(self, job, progress_text):
+        """Replace the progress line of a file"""
+        mark = job.get('mark')
+        if not mark or mark not in self.message_text.mark_names():
             return
 
         self.message_text.config(state="normal")
         
         # Delete existing progress line
-        self.message_text.delete(self.current_progress_start, self.current_progress_end)
+        self.message_text.delete(mark, f"{mark}_end")
         
         # Insert new progress text
-        self.message_text.insert(self.current_progress_start, f"{progress_text}\n", "progress")
+        self.message_text.insert(mark, f"{progress_text}\n", "progress")
         
         # Update end position
-        self.current_progress_end = self.message_text.index(
-            f"{self.current_progress_start} + {len(progress_text)+1} chars"
-        )
+        self.message_text.mark_set(f"{mark}_end", f"{mark} + {len(progress_text)+1} chars")
         
         self.message_text.see("end")
         self.message_text.config(state="disabled")    
 
+    def _clear_progress_line(self, job):
+        """Forget a finished file's progress line marks"""
+        mark = job.get('mark')
+        if mark:
+            self.message_text.mark_unset(mark, f"{mark}_end")
+
     def update_total_progress(self, value, total_files):
         self.total_progress_bar["value"] = value
         total_percent = int((value / total_files) * 100) if total_files > 0 else 0
@@ -0,0 +1,84 @@
+# gui/progress_bus.py
+import logging
+import queue
+
+# ~30 redraws per second is smooth enough for progress bars and labels
+DEFAULT_INTERVAL_MS = 33
+
+class ProgressBus:
+    """
+    Channel from worker threads to Tk widgets.
+
+    Workers post callbacks from any thread; the Tk thread drains them every
+    interval_ms. Updates posted with a key replace any pending update with
+    the same key, so only the latest state of a widget is rendered however
+    fast pages finish. Updates without a key (log lines, headers) are never
+    dropped and run in the order they were posted.
+
+    One bus is shared by every tab of a window, see for_widget().
+    """
+
+    def __init__(self, widget, interval_ms: int = DEFAULT_INTERVAL_MS):
+        self._widget = widget
+        self._interval = interval_ms
+        self._queue = queue.SimpleQueue()
+        self._after_id = None
+
+    @classmethod
+    def for_widget(cls, widget) -> "ProgressBus":
+        """The bus of the widget's toplevel window, created and started on first use."""
+        top = widget.winfo_toplevel()
+        bus = getattr(top, "_progress_bus", None)
+        if bus is None:
+            bus = top._progress_bus = cls(top)
+            bus.start()
+        return bus
+
+    def post(self, key, func, *args):
+        """Queue func(*args) for the Tk thread, replacing a pending update with the same key."""
+        self._queue.put((key, func, args))
+
+    def call(self, func, *args):
+        """Queue func(*args) for the Tk thread; never coalesced."""
+        self._queue.put((None, func, args))
+
+    def start(self):
+        if self._after_id is None:
+            self._after_id = self._widget.after(self._interval, self._drain)
+
+    def stop(self):
+        """Stop the timer and apply whatever is still pending (Tk thread only)."""
+        if self._after_id is not None:
+            self._widget.after_cancel(self._after_id)
+            self._after_id = None
+        self.flush()
+
+    def flush(self):
+        """Apply pending updates now (Tk thread only)."""
+        updates = []
+        positions = {}
+        while True:
+            try:
+                key, func, args = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if key is not None:
+                # A keyed update moves to the position of its latest post
+                if key in positions:
+                    updates[positions[key]] = None
+                positions[key] = len(updates)
+            updates.append((func, args))
+
+        for update in updates:
+            if update is None:
+                continue
+            func, args = update
+            try:
+                func(*args)
+            except Exception as e:
+                # A destroyed widget or a failing callback must not stop the bus
+                logging.error(f"Progress update failed: {str(e)}")
+
+    def _drain(self):
+        self.flush()
+        self._after_id = self._widget.after(self._interval, self._drain)
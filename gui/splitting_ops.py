@@ -4,10 +4,11 @@ import threading
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import subprocess
-import time
 
 from .print_manager import PrintManager  
-from logic.split import split_pdf
+from .progress_bus import ProgressBus
+from logic.split import split_pdf, SPLIT_MODES
+from logic.progress import ThroughputEstimator
 from .utils import ToolTip, CustomText, format_time, truncate_path, truncate_filename
 
 
@@ -24,11 +25,11 @@ class SplittingOps:
         self.font = FONT
         self.split_file = None
         self.split_output_folder = ""
-        self.split_start_time = None
-        self.last_update_time = None
+        self.estimator = None
         self.eta = "Calculating..."
         self.generated_files = []
         self.print_manager = None  # PrintManager instance holder
+        self.progress_bus = ProgressBus.for_widget(root)
         self.setup_variables()
 
     def setup_variables(self):
@@ -42,6 +43,7 @@ class SplittingOps:
         self.splitting_frame.pack(side="left", fill="both", expand=True, padx=UI_PADDING, pady=5)
         self.setup_header()
         self.setup_file_selection()
+        self.setup_split_mode()
         self.setup_compression_options()
         self.setup_output_folder()
         self.setup_progress_bar()
@@ -59,6 +61,20 @@ class SplittingOps:
         self.select_split_file_button.pack(pady=20)
         ToolTip(self.select_split_file_button, "Select a PDF file to split.")
 
+    def setup_split_mode(self):
+        mode_frame = ttk.Frame(self.splitting_frame)
+        mode_frame.pack(pady=5)
+        ttk.Label(mode_frame, text="Split into:").pack(side="left", padx=5)
+        self.split_mode_var = tk.StringVar(value="pages")
+        mode_combo = ttk.Combobox(mode_frame, textvariable=self.split_mode_var, values=list(SPLIT_MODES), width=9, state="readonly")
+        mode_combo.pack(side="left", padx=5)
+        ToolTip(mode_combo, "pages: one file per page | chunks: N pages per file | ranges: e.g. 1-3,4,10- | "
+                            "bookmarks: one file per top-level bookmark | size: files of at most N MB")
+        self.split_mode_value_var = tk.StringVar(value="")
+        self.split_mode_entry = ttk.Entry(mode_frame, textvariable=self.split_mode_value_var, width=12)
+        self.split_mode_entry.pack(side="left", padx=5)
+        ToolTip(self.split_mode_entry, "Pages per file (chunks), page ranges (ranges) or MB per file (size)")
+
     def setup_compression_options(self):
         self.compress_after_split_var = tk.BooleanVar(value=False)
         self.compress_checkbox = ttk.Checkbutton(self.splitting_frame, text="Try to compress files after splitting", variable=self.compress_after_split_var, command=self.toggle_compress_options)
@@ -73,6 +89,16 @@ class SplittingOps:
             rb.pack(side="left", padx=5)
             ToolTip(rb, "If the PDF has been previously compressed, further compression will yield minimal or no improvements.")
 
+        self.split_engine_var = tk.StringVar(value="pypdf2")
+        self.single_pass_checkbox = ttk.Checkbutton(self.splitting_frame, text="Split and compress in one Ghostscript pass", variable=self.split_engine_var, onvalue="ghostscript", offvalue="pypdf2")
+        self.single_pass_checkbox.pack(pady=5)
+        ToolTip(self.single_pass_checkbox, "Much faster for large files: fonts and images shared by pages are processed once")
+
+        self.optimize_split_var = tk.BooleanVar(value=False)
+        self.optimize_checkbox = ttk.Checkbutton(self.splitting_frame, text="Smaller split files (subset fonts, drop unused resources)", variable=self.optimize_split_var)
+        self.optimize_checkbox.pack(pady=5)
+        ToolTip(self.optimize_checkbox, "Each page keeps only the fonts and images it uses instead of a full copy of the document's")
+
         self.delete_after_split_var = tk.BooleanVar(value=False)
         self.delete_checkbox = ttk.Checkbutton(self.splitting_frame, text="Delete original files after splitting", variable=self.delete_after_split_var, style='Warning.TCheckbutton')
         self.delete_checkbox.pack(pady=10)
@@ -194,6 +220,7 @@ class SplittingOps:
         state = tk.NORMAL if self.compress_after_split_var.get() else tk.DISABLED
         for widget in self.compression_frame.winfo_children():
             widget.config(state=state)
+        self.single_pass_checkbox.config(state=state)
 
     def select_split_file(self):
         """Handle PDF file selection for splitting."""
@@ -269,33 +296,94 @@ class SplittingOps:
             messagebox.showwarning("Missing Input", "Select a file and output folder before splitting.")
             return
 
+        try:
+            split_mode = self._split_mode_options()
+        except ValueError as e:
+            messagebox.showwarning("Split Mode", str(e))
+            return
+
         self._prepare_for_split() 
         threading.Thread(
             target=self.split_file_thread,
             daemon=True,
             args=(
                 self.compress_after_split_var.get(),
-                self.split_compression_level_var.get()
+                self.split_compression_level_var.get(),
+                self._selected_split_engine(),
+                split_mode
             )  
         ).start()
 
-    def split_file_thread(self, compress, compression_level):
+    def _split_mode_options(self):
+        """split_pdf keyword arguments for the chosen mode and its value"""
+        mode = self.split_mode_var.get()
+        value = self.split_mode_value_var.get().strip()
+        if mode == "chunks":
+            if not value.isdigit() or int(value) < 1:
+                raise ValueError("Enter the number of pages per file")
+            return {"mode": mode, "chunk_size": int(value)}
+        if mode == "ranges":
+            if not value:
+                raise ValueError("Enter page ranges, e.g. 1-3,4,10-")
+            return {"mode": mode, "ranges": value}
+        if mode == "size":
+            try:
+                max_mb = float(value)
+            except ValueError:
+                raise ValueError("Enter the maximum size per file in MB")
+            if max_mb <= 0:
+                raise ValueError("Enter the maximum size per file in MB")
+            return {"mode": mode, "max_mb": max_mb}
+        return {"mode": mode}
+
+    def _selected_split_engine(self):
+        # The single Ghostscript pass only writes one file per page
+        if (self.compress_after_split_var.get() and self.split_engine_var.get() == "ghostscript"
+                and self.split_mode_var.get() == "pages"):
+            return "ghostscript"
+        return "optimized" if self.optimize_split_var.get() else "pypdf2"
+
+    def split_file_thread(self, compress, compression_level, engine="pypdf2", split_mode=None):
         try:
             success, summary, output_files = split_pdf(
                 self.split_file,
                 self.split_output_folder,
                 compress=compress,
                 compression_level=compression_level,
-                update_callback=lambda f, p: self.root.after_idle(self._update_split_progress, f, p),
-                log_callback=lambda msg: self.root.after(0, self.append_log, msg)
+                engine=engine,
+                **(split_mode or {}),
+                update_callback=self._on_split_progress,
+                log_callback=self._on_split_log
             )
 
-            self.root.after(0, self._handle_split_result, success, summary, output_files)
+            # Queued behind the last progress updates so they cannot overwrite the result
+            self.progress_bus.call(self._handle_split_result, success, summary, output_files)
 
         except Exception as e:
-            self.root.after(0, self._handle_critical_error, e)
+            self.progress_bus.call(self._handle_critical_error, e)
         finally:
-            self.root.after(0, self._reset_ui_state)
+            self.progress_bus.call(self._reset_ui_state)
+
+    def _on_split_progress(self, current_page, total_pages, bytes_done):
+        """Worker side: track throughput for every page, draw only the latest"""
+        # Add null check for safety
+        if self.estimator is None:
+            self.estimator = ThroughputEstimator(unit="pages")  # Fallback initialization
+
+        # Smoothed rate, so cheap text pages followed by heavy image pages do not skew the ETA
+        self.estimator.total_units = total_pages
+        self.estimator.update(current_page, bytes_done)
+        eta_seconds = self.estimator.eta_seconds()
+        eta = format_time(eta_seconds) if eta_seconds is not None else "Calculating..."
+        self.progress_bus.post("split_progress", self._update_split_progress,
+                               current_page, total_pages, eta, self.estimator.rate_text())
+
+    def _on_split_log(self, message):
+        if message.startswith("SPLIT_PROGRESS:"):
+            # The progress line is rewritten in place; intermediate pages can be skipped
+            self.progress_bus.post("split_progress_line", self.append_log, message)
+        else:
+            self.progress_bus.call(self.append_log, message)
 
     def _handle_split_result(self, success, summary, output_files):
         if success:
@@ -312,39 +400,23 @@ class SplittingOps:
 
     def _prepare_for_split(self):
         """Prepare UI for splitting process."""
-        self.split_start_time = time.time()
-        self.last_update_time = self.split_start_time
+        self.estimator = ThroughputEstimator(unit="pages")
         self.eta = "Calculating..."
         self.split_status_label_selected.config(text="\nStarting splitting process...")
         self.start_split_button.config(state=tk.DISABLED)
 
-    def _update_split_progress(self, current_page, total_pages):
+    def _update_split_progress(self, current_page, total_pages, eta, rate):
         """Update progress with ETA calculation"""
-        now = time.time()
-
-        # Add null check for safety
-        if self.split_start_time is None:
-            self.split_start_time = now  # Fallback initialization
-
-        elapsed = now - self.split_start_time
-
         # Change progress bar style based on compression
         if self.compress_after_split_var.get():
             self.progress.config(style='Compress.Horizontal.TProgressbar')                
         
-        # Calculate ETA only after first page to avoid division by zero
-        if current_page > 1:
-            time_per_page = elapsed / (current_page - 1)
-            remaining_pages = total_pages - current_page
-            eta_seconds = remaining_pages * time_per_page
-            self.eta = format_time(eta_seconds)
-        else:
-            self.eta = "Calculating..."
+        self.eta = eta
             
         # Update progress components
         progress = int((current_page / total_pages) * 100)
         status_text = (            
-            f" Time remaining: {self.eta}"
+            f" Time remaining: {self.eta} | {rate}"
         )
         
         self.progress["value"] = progress
@@ -354,9 +426,6 @@ class SplittingOps:
         else:
             self.split_status_label_selected.config(text=status_text, style = 'Blue.TLabel')
             self.progress_percentage_label.config(text=f"{progress}%  ", style = 'Blue.TLabel' )
-        
-        # Force UI update
-        self.root.update_idletasks()    
 
     def _handle_split_success(self, summary):
         msg = summary
@@ -283,7 +283,7 @@ class SplittingOps:
                 self.split_output_folder,
                 compress=compress,
                 compression_level=compression_level,
-                update_callback=lambda f, p: self.root.after_idle(self._update_split_progress, f, p),
+                update_callback=lambda f, p, _bytes_done: self.root.after_idle(self._update_split_progress, f, p),
                 log_callback=lambda msg: self.root.after(0, self.append_log, msg)
             )
             
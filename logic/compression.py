@@ -1,9 +1,19 @@
 # logic/compression.py
+import io
 import os
+import hashlib
+import sys
 import logging
-from pikepdf import Pdf, PasswordError, ObjectStreamMode, Name, PdfError
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from pikepdf import Pdf, PasswordError, ObjectStreamMode, Name, PdfError, Object, Dictionary, Array, Stream
 from typing import Tuple
 
+# Execution backends for batch compression
+EXECUTOR_BACKENDS = ("thread", "process")
+MAX_TASKS_PER_CHILD = 25  # Recycle worker processes to release pikepdf/qpdf memory
+
 # Configure logging
 logging.basicConfig(
     filename="compression_log.txt",
@@ -12,11 +22,12 @@ logging.basicConfig(
 )
 
 def find_pdfs(directory):
-    """Recursively find all PDF files in a directory."""
+    """Recursively find all PDF files in a directory, by name within each folder."""
     pdf_files = []
     try:
-        for root, _, files in os.walk(directory):
-            for file in files:
+        for root, dirs, files in os.walk(directory):
+            dirs.sort()  # os.walk lists entries in whatever order the file system returns them
+            for file in sorted(files):
                 if file.lower().endswith(".pdf"):
                     pdf_files.append(os.path.join(root, file))
         logging.info(f"Found {len(pdf_files)} PDFs in {directory}")
@@ -24,8 +35,34 @@ def find_pdfs(directory):
         logging.error(f"Error scanning {directory}: {str(e)}")
     return pdf_files
 
+def create_executor(backend="thread", max_workers=None, max_tasks_per_child=MAX_TASKS_PER_CHILD):
+    """
+    Create the executor used to run compress_pdf over a batch of files.
+
+    "thread" keeps the historical ThreadPoolExecutor behaviour. "process" runs
+    compress_pdf in worker processes so the CPU-bound image recompression and
+    save are not serialised by the GIL. Workers are recycled after
+    max_tasks_per_child files where the interpreter supports it (3.11+).
+    """
+    if backend not in EXECUTOR_BACKENDS:
+        raise ValueError(f"Unknown executor backend: {backend}. Use one of {EXECUTOR_BACKENDS}")
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    if backend == "thread":
+        return ThreadPoolExecutor(max_workers=max_workers)
+
+    if sys.version_info >= (3, 11) and max_tasks_per_child:
+        return ProcessPoolExecutor(max_workers=max_workers, max_tasks_per_child=max_tasks_per_child)
+
+    logging.info("Worker recycling requires Python 3.11+; using long-lived worker processes")
+    return ProcessPoolExecutor(max_workers=max_workers)
+
 def compress_pdf(input_path, output_path, level="medium", overwrite=False) -> Tuple[bool, str, int, int]:
     """
+    output_path may also be a writable binary stream (see compress_pdf_to_memory).
+
     Returns tuple:
     (success: bool, message: str, original_size: int, compressed_size: int)
     """
@@ -84,7 +121,10 @@ def compress_pdf(input_path, output_path, level="medium", overwrite=False) -> Tu
             )
 
         # --- Post-Compression Validation ---
-        compressed_size = os.path.getsize(output_path)
+        if isinstance(output_path, (str, os.PathLike)):
+            compressed_size = os.path.getsize(output_path)
+        else:
+            compressed_size = output_path.seek(0, os.SEEK_END)
         compression_ratio = max(0, ((original_size - compressed_size) / original_size) * 100)
         
         logging.info(f"Success: {input_path} | Ratio: {compression_ratio:.2f}%")
@@ -102,3 +142,175 @@ def compress_pdf(input_path, output_path, level="medium", overwrite=False) -> Tu
     except (TypeError, ValueError, AttributeError) as e:
         logging.error(f"PDF structure error in {input_path}: {str(e)}")
         return False, "Invalid PDF structure", original_size, 0
+
+def compress_pdf_to_memory(input_path, level="medium", spill_threshold=None,
+                           spill_dir=None) -> Tuple[bool, object, int, int]:
+    """
+    Compress a PDF for immediate use by another step (e.g. merging) without
+    writing it to a temporary file and reading it back.
+
+    Returns (success, result, original_size, compressed_size) where result
+    is the compressed PDF as bytes. Inputs larger than spill_threshold bytes
+    are compressed into a temporary file in spill_dir instead, and result is
+    its path; the caller deletes it. On failure result is the error message,
+    as with compress_pdf. Bytes are returned rather than a pikepdf.Pdf so
+    the result can come back from a worker process.
+    """
+    try:
+        input_size = os.path.getsize(input_path)
+    except OSError:
+        input_size = 0
+
+    if spill_threshold is not None and input_size > spill_threshold:
+        fd, temp_path = tempfile.mkstemp(prefix="TEMP_", suffix=".pdf", dir=spill_dir)
+        os.close(fd)
+        success, message, original_size, compressed_size = compress_pdf(input_path, temp_path, level)
+        if not success:
+            os.remove(temp_path)
+        return success, message, original_size, compressed_size
+
+    buffer = io.BytesIO()
+    success, message, original_size, compressed_size = compress_pdf(input_path, buffer, level)
+    return success, buffer.getvalue() if success else message, original_size, compressed_size
+
+def deduplicate_objects(pdf) -> Tuple[int, int]:
+    """
+    Point every reference to a duplicated object at one copy of it.
+
+    Covers streams anywhere in the document and the dictionaries and arrays
+    used by page resources (font dictionaries, color spaces...); pages,
+    annotations and other objects whose identity matters are never merged.
+    Streams are identical when their raw (still encoded) data and their
+    dictionaries, /Length aside, are the same. The duplicates are left
+    unreferenced and are not written when the PDF is saved. Runs until no
+    duplicates are left, so an image is found once its color space and
+    soft mask have been deduplicated. Only stream dictionaries change
+    between passes, so each stream's data is hashed once.
+
+    Returns (duplicate_objects, bytes_saved), bytes_saved being the raw
+    size of the objects dropped.
+    """
+    resources = _resource_objgens(pdf)
+    dropped = set()  # Duplicates stay in the object table until the PDF is saved
+    digests = {}  # objgen -> (sha256 of the raw data, raw size)
+    bytes_saved = 0
+    while True:
+        originals = {}
+        replacements = {}
+        for obj in pdf.objects:
+            if obj.objgen in dropped:
+                continue
+            if isinstance(obj, Stream):
+                if obj.get("/Type") in (Name.ObjStm, Name.XRef):
+                    continue
+                if obj.objgen not in digests:
+                    data = obj.read_raw_bytes()
+                    digests[obj.objgen] = (hashlib.sha256(data).digest(), len(data))
+                digest, size = digests[obj.objgen]
+                key = (digest, _stream_dict_key(obj))
+            elif obj.objgen in resources:
+                key = (None, obj.unparse(resolved=True))
+                size = len(key[1])
+            else:
+                continue
+            original = originals.setdefault(key, obj)
+            if original.objgen != obj.objgen:
+                replacements[obj.objgen] = original
+                bytes_saved += size
+        if not replacements:
+            return len(dropped), bytes_saved
+
+        dropped.update(replacements)
+        _redirect_references(pdf.trailer, replacements)
+        for obj in pdf.objects:
+            _redirect_references(obj, replacements)
+
+def _resource_objgens(pdf) -> set:
+    """Object ids of the indirect objects reachable from the pages' /Resources."""
+    found = set()
+    stack = [page.obj.get("/Resources") for page in pdf.pages]
+    while stack:
+        obj = stack.pop()
+        if not isinstance(obj, Object):
+            continue
+        if isinstance(obj, (Dictionary, Stream)) and obj.get("/Type") in (Name.Page, Name.Pages, Name.Annot):
+            continue
+        if obj.is_indirect:
+            if obj.objgen in found:
+                continue
+            found.add(obj.objgen)
+        if isinstance(obj, (Dictionary, Stream)):
+            stack.extend(obj[key] for key in obj.keys() if key not in ("/Parent", "/P"))
+        elif isinstance(obj, Array):
+            stack.extend(obj)
+    return found
+
+def _stream_dict_key(stream) -> bytes:
+    # Indirect values unparse as "N 0 R", so they only match once deduplicated themselves
+    parts = []
+    for key in sorted(stream.keys()):
+        if key == "/Length":
+            continue
+        value = stream[key]
+        parts.append(key.encode() + (value.unparse() if isinstance(value, Object) else repr(value).encode()))
+    return b" ".join(parts)
+
+def _redirect_references(obj, replacements):
+    """Replace references to the keys of replacements inside obj and its direct children."""
+    if isinstance(obj, (Dictionary, Stream)):
+        items = [(key, obj[key]) for key in obj.keys()]
+    elif isinstance(obj, Array):
+        items = list(enumerate(obj))
+    else:
+        return
+    for key, value in items:
+        if not isinstance(value, Object):
+            continue  # Numbers and booleans come back as Python values
+        if value.is_indirect:
+            if value.objgen in replacements:
+                obj[key] = replacements[value.objgen]
+        else:
+            _redirect_references(value, replacements)
+
+def optimize_merged_pdf(pdf_path) -> dict:
+    """
+    Compress a merged PDF as a whole, in place.
+
+    Compressing each input separately cannot remove what the inputs have in
+    common; this pass over the merged document removes unreferenced
+    resources, keeps one copy of objects repeated across the inputs (the
+    same letterhead image or font in every file) and packs the objects
+    into object streams.
+
+    Returns a dict with original_size, optimized_size, duplicate_objects
+    and dedup_bytes_saved.
+    """
+    original_size = os.path.getsize(pdf_path)
+    # Written next to the original and swapped in, so the input is read from
+    # disk while saving instead of being loaded into memory to allow overwriting it
+    fd, temp_path = tempfile.mkstemp(prefix="TEMP_", suffix=".pdf",
+                                     dir=os.path.dirname(os.path.abspath(pdf_path)))
+    os.close(fd)
+    try:
+        with Pdf.open(pdf_path) as pdf:
+            pdf.remove_unreferenced_resources()
+            duplicate_objects, dedup_bytes_saved = deduplicate_objects(pdf)
+            pdf.save(
+                temp_path,
+                compress_streams=True,
+                object_stream_mode=ObjectStreamMode.generate
+            )
+        shutil.copymode(pdf_path, temp_path)  # mkstemp creates the file readable by its owner only
+        os.replace(temp_path, pdf_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    optimized_size = os.path.getsize(pdf_path)
+    logging.info(f"Optimized merged PDF: {pdf_path} | {duplicate_objects} duplicate objects, "
+                 f"{original_size} -> {optimized_size} bytes")
+    return {
+        "original_size": original_size,
+        "optimized_size": optimized_size,
+        "duplicate_objects": duplicate_objects,
+        "dedup_bytes_saved": dedup_bytes_saved
+    }
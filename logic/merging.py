@@ -1,56 +1,288 @@
 # logic/merging.py (revised)
 import os
 import logging
+import threading
+from collections import deque
 from PyPDF2 import PdfMerger
-from .compression import compress_pdf
+from pikepdf import Pdf, Job, StreamDecodeLevel, OutlineItem, NameTree, Array, Dictionary, Name, String
+from .compression import compress_pdf_to_memory, create_executor, optimize_merged_pdf
+from .utils import peak_rss_bytes
+import io
 import tempfile
 
+MERGE_ENGINES = ("pypdf2", "pikepdf")
+MERGE_BUFFER_MB = 256  # Input data the pikepdf engine holds in memory before spilling to disk
+MERGE_SPILL_MB = 64  # Inputs larger than this are compressed to a temp file rather than in memory
+
+class PikepdfMerger:
+    """
+    Merges PDFs with pikepdf, with the same append/write/close interface
+    as PyPDF2's PdfMerger.
+
+    Pages are copied with pages.extend(), so resources the pages of one
+    input share are copied once, and each input is closed right after.
+    Resources repeated across inputs (the same logo or font in every file)
+    are not shared here: the inputs' copies are separate objects, and
+    earlier inputs may already be spilled to a part file. Sharing them is
+    left to the pass over the finished output, optimize_merged_pdf
+    (merge_pdfs' compress_after_merge), which sees the whole document.
+    pikepdf copies the page data into memory, so once the inputs appended
+    since the last spill reach buffer_mb, the pages merged since then are
+    saved to a temporary part file and a new part is started. write()
+    concatenates the parts with qpdf's page selection (pikepdf.Job), which
+    reads their streams from disk while writing the output instead of
+    loading them. Every page is written twice, once to its part and once
+    to the output, however many files are merged, and memory stays near
+    buffer_mb plus one input. A smaller buffer only means more part files.
+
+    Streams are copied as they are, without being decoded or recompressed.
+
+    As with PdfMerger, each input's outline is imported unless
+    import_outline is False, nested under outline_item when one is given.
+    Outline entries only record page numbers in the merged document (the
+    page offset of their input when it was appended), and the outline is
+    built from them when the output is written.
+    """
+
+    def __init__(self, buffer_mb: float = MERGE_BUFFER_MB, spill_dir: str = None):
+        self.buffer_bytes = buffer_mb * 1024 * 1024
+        self.spill_dir = spill_dir
+        self._merged = Pdf.new()
+        self._buffered = 0
+        self._parts = []  # Part files spilled so far, in page order
+        self._outline = []  # (title, page number or None, children) entries
+        self.page_count = 0
+
+    def append(self, source, outline_item: str = None, import_outline: bool = True):
+        """Append every page of a PDF given as a path or an in-memory io.BytesIO."""
+        if isinstance(source, io.BytesIO):
+            self._buffered += source.getbuffer().nbytes
+        else:
+            self._buffered += os.path.getsize(source)
+        with Pdf.open(source) as pdf:
+            offset = self.page_count
+            outline = self._read_outline(pdf, offset) if import_outline else []
+            self._merged.pages.extend(pdf.pages)
+            self.page_count += len(pdf.pages)
+        if outline_item is not None:
+            self._outline.append((outline_item, offset, outline))
+        else:
+            self._outline.extend(outline)
+        if self._buffered >= self.buffer_bytes:
+            self._spill()
+
+    @staticmethod
+    def _read_outline(pdf, offset: int) -> list:
+        """The outline of pdf as entries pointing at pages of the merged document."""
+        page_numbers = {page.obj.objgen: offset + i for i, page in enumerate(pdf.pages)}
+        named = None
+
+        def target(item):
+            nonlocal named
+            dest = item.destination
+            if dest is None and item.action is not None and item.action.get("/S") == Name.GoTo:
+                dest = item.action.get("/D")
+            if isinstance(dest, (String, Name)):
+                if named is None:
+                    named = _named_destinations(pdf)
+                dest = named.get(str(dest))
+            if isinstance(dest, Dictionary):
+                dest = dest.get("/D")
+            if isinstance(dest, Array) and len(dest) > 0 and isinstance(dest[0], Dictionary):
+                return page_numbers.get(dest[0].objgen)
+            return None  # Points outside the document or nowhere; kept as a heading
+
+        def convert(items):
+            return [(item.title, target(item), convert(item.children)) for item in items]
+
+        return convert(pdf.open_outline().root)
+
+    def _write_outline(self, pdf):
+        # Looked up once: resolving each page number separately walks the page list every time
+        pages = [page.obj for page in pdf.pages]
+
+        def build(entries):
+            items = []
+            for title, page_number, children in entries:
+                dest = Array([pages[page_number], Name.Fit]) if page_number is not None else None
+                item = OutlineItem(title, dest)
+                item.children.extend(build(children))
+                items.append(item)
+            return items
+
+        with pdf.open_outline() as outline:
+            outline.root.extend(build(self._outline))
+
+    @staticmethod
+    def _save(pdf, path: str):
+        pdf.save(path, compress_streams=False, stream_decode_level=StreamDecodeLevel.none)
+
+    def _spill(self):
+        """Write the pages merged since the last spill to a new part file."""
+        fd, part_path = tempfile.mkstemp(prefix="merge_part_", suffix=".pdf", dir=self.spill_dir)
+        os.close(fd)
+        self._parts.append(part_path)  # Recorded first so close() removes it if saving fails
+        self._save(self._merged, part_path)
+        self._merged.close()
+        self._merged = Pdf.new()
+        self._buffered = 0
+
+    def write(self, output_path: str):
+        if not self._parts:
+            if self._outline:
+                self._write_outline(self._merged)
+            self._save(self._merged, output_path)
+            return
+        if len(self._merged.pages):
+            self._spill()
+        job = Job([
+            "pikepdf", "--empty", "--compress-streams=n", "--decode-level=none",
+            "--pages", *self._parts, "--", os.path.abspath(output_path)
+        ])
+        pdf = job.create_pdf()
+        try:
+            if self._outline:
+                self._write_outline(pdf)
+            job.write_pdf(pdf)
+        finally:
+            pdf.close()
+
+    def close(self):
+        self._merged.close()
+        for part_path in self._parts:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+        self._parts = []
+
+def _named_destinations(pdf) -> dict:
+    """Named destinations of pdf, from the /Dests name tree and the older /Dests dictionary."""
+    named = {}
+    dests = pdf.Root.get("/Dests")
+    if isinstance(dests, Dictionary):
+        named.update(dests.items())  # Keyed by name, e.g. "/Chapter1"
+    names = pdf.Root.get("/Names")
+    if isinstance(names, Dictionary) and "/Dests" in names:
+        named.update(NameTree(names.Dests).items())  # Keyed by string, e.g. "Chapter1"
+    return named
+
 def merge_pdfs(
     file_paths: list,
     output_path: str,
     compress_before_merge: bool = False,
     compression_level: str = "medium",
     update_callback: callable = None,
-    log_callback: callable = None
+    log_callback: callable = None,
+    engine: str = "pypdf2",
+    buffer_mb: float = MERGE_BUFFER_MB,
+    workers: int = None,
+    backend: str = "thread",
+    spill_mb: float = MERGE_SPILL_MB,
+    compress_after_merge: bool = False,
+    bookmarks: bool = False,
+    keep_outlines: bool = True
 ) -> tuple:
     """
     Merge PDF files with optional compression and progress updates.
+
+    With compress_before_merge, files are compressed by a pool of workers
+    (create_executor(backend, workers)) ahead of the merge and appended in
+    their original order as they become ready. Compressed files are
+    handed to the merger in memory; only inputs over spill_mb go through a
+    temporary file.
+    update_callback(file, count, stage) reports both stages: "compressed"
+    (count files compressed so far, in completion order, from a pool
+    thread) and "appended" (count files merged so far, in order).
+
+    With compress_after_merge, the merged document is compressed as a
+    whole (optimize_merged_pdf), which also removes streams repeated
+    across the inputs; the summary's post_merge holds its results.
+
+    With bookmarks, the output gets a top-level bookmark per input, named
+    after the file and pointing at its first page. keep_outlines keeps the
+    inputs' own bookmarks, nested under the file's bookmark if there is
+    one. Both engines take page numbers from the merged page count at the
+    time each input is appended, so the outline costs no extra pass.
+
+    engine: "pypdf2" (PdfMerger, keeps every parsed input in memory until
+    the end) or "pikepdf" (PikepdfMerger, holds at most about buffer_mb of
+    input data in memory and spills the rest to a temporary file).
+    The summary includes peak_rss_bytes, the process's peak memory.
     Returns: (success: bool, summary: dict | None, error: str | None)
     """
-    merger = PdfMerger()
+    if engine not in MERGE_ENGINES:
+        raise ValueError(f"Unknown merge engine: {engine}. Use one of {MERGE_ENGINES}")
+    if engine == "pikepdf":
+        # Spill next to the output: same volume, and it has room for the result anyway
+        merger = PikepdfMerger(buffer_mb, spill_dir=os.path.dirname(os.path.abspath(output_path)))
+    else:
+        merger = PdfMerger()
     temp_files = []
     total_original = 0
     total_compressed = 0
     log_messages = []  # Store merge log messages during process
+    compressor = None
+    pending = deque()  # Futures of files submitted for compression, in merge order
+    next_submit = 0
+    compressed_count = 0
+    count_lock = threading.Lock()
 
     def add_log(message):
         if log_callback:
             log_callback(message)
         log_messages.append(message)
 
+    def append(file, source):
+        # source is file itself or its compressed copy; the bookmark is named after file
+        title = os.path.splitext(os.path.basename(file))[0] if bookmarks else None
+        merger.append(source, outline_item=title, import_outline=keep_outlines)
+
+    def submit_compression(file):
+        future = compressor.submit(compress_pdf_to_memory, file, compression_level,
+                                   spill_threshold=spill_mb * 1024 * 1024)
+        future.add_done_callback(lambda _, file=file: report_compressed(file))
+        return future
+
+    def report_compressed(file):
+        # Runs on a pool thread as each compression finishes, in any order
+        nonlocal compressed_count
+        with count_lock:
+            compressed_count += 1
+            done = compressed_count
+        if update_callback:
+            update_callback(file, done, "compressed")
+
     try:
         add_log(f"Starting merge of {len(file_paths)} files")
         add_log(f"Output destination: {output_path}\n")
 
+        if compress_before_merge:
+            compressor = create_executor(backend, max_workers=workers)
+            # Files are compressed ahead of the merge but no further than this
+            window = 2 * (workers or os.cpu_count() or 1)
+
         for idx, file in enumerate(file_paths):
-            if update_callback:
-                update_callback(file, idx + 1)
+            if compressor:
+                while next_submit < len(file_paths) and next_submit < idx + window:
+                    pending.append(submit_compression(file_paths[next_submit]))
+                    next_submit += 1
 
             file_size = os.path.getsize(file)
             add_log(f"Processing: {os.path.basename(file)} ({file_size/1024:.1f} KB)")
 
-            if compress_before_merge:
-                # Create temp file in system temp directory
-                temp_dir = tempfile.gettempdir()
-                temp_filename = f"TEMP_{os.path.basename(file)}"
-                temp_file = os.path.join(temp_dir, temp_filename)
-                
-                success = compress_pdf(file, temp_file, compression_level)
-                
+            if compressor:
+                future = pending.popleft()
+                try:
+                    success, compressed, _, compressed_size = future.result()
+                except Exception as e:
+                    logging.error(f"Compression worker failed on {file}: {str(e)}")
+                    success = False
+
                 if success:
-                    temp_files.append(temp_file)
-                    merger.append(temp_file)
-                    compressed_size = os.path.getsize(temp_file)
+                    if isinstance(compressed, bytes):
+                        append(file, io.BytesIO(compressed))
+                    else:
+                        temp_files.append(compressed)  # Large input, compressed to a temp file
+                        append(file, compressed)
                     total_original += file_size
                     total_compressed += compressed_size
                     ratio = max((1 - (compressed_size / file_size)) * 100, 0)
@@ -60,23 +292,44 @@ def merge_pdfs(
                         ratio <= 0
                         add_log(f"  ⚠️ Compression ineffective (0%)")
                 else:
-                    merger.append(file)
+                    append(file, file)
                     add_log(f"  ✗ Compression failed; using original file")
                     total_original += file_size
                     total_compressed += file_size
             else:
-                merger.append(file)
+                append(file, file)
                 total_original += file_size
                 total_compressed += file_size  # Fix: Track as uncompressed
 
+            if update_callback:
+                update_callback(file, idx + 1, "appended")
+
         merger.write(output_path)
         merger.close()
 
+        post_merge = None
+        if compress_after_merge:
+            add_log("\nCompressing the merged document...")
+            try:
+                post_merge = optimize_merged_pdf(output_path)
+            except Exception as e:
+                # The merge itself succeeded; keep its output
+                logging.error(f"Post-merge compression failed on {output_path}: {str(e)}", exc_info=True)
+                add_log(f"  ⚠️ Post-merge compression failed; keeping the merged file as is")
+            else:
+                add_log(f"  ✓ Removed {post_merge['duplicate_objects']} duplicate objects "
+                        f"({post_merge['dedup_bytes_saved']/1024:.1f} KB)")
+                add_log(f"  ✓ {post_merge['original_size']/1024:.1f} KB → "
+                        f"{post_merge['optimized_size']/1024:.1f} KB")
+
         summary_data = {
+            "engine": engine,
+            "peak_rss_bytes": peak_rss_bytes(),
             "file_count": len(file_paths),
             "total_original": total_original,
             "total_compressed": total_compressed,
             "used_compression": compress_before_merge,
+            "post_merge": post_merge,
             "output_path": output_path,
             "log_messages": log_messages
         }
@@ -89,6 +342,15 @@ def merge_pdfs(
         logging.error(error_msg, exc_info=True)
         return False, None, str(e)
     finally:
+        if compressor:
+            # Drop compressions not started yet after a failure; temp files are removed below
+            compressor.shutdown(wait=True, cancel_futures=True)
+            for future in pending:
+                if not future.cancelled() and future.exception() is None:
+                    success, compressed, _, _ = future.result()
+                    if success and not isinstance(compressed, bytes):
+                        temp_files.append(compressed)
+        merger.close()  # Closing twice is harmless; this releases inputs after a failure
         if temp_files:
             add_log("\nCleaning up temporary files...")
             for temp_file in temp_files:
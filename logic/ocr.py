@@ -1,70 +1,667 @@
-
 # logic/ocr.py
 import fitz  # PyMuPDF
 import pytesseract
-from PIL import Image
-import io
+from PIL import Image, ImageStat
+import json
+import logging
+import math
 import os
-from docx import Document
-from docx.enum.text import WD_BREAK
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from .ocr_cache import OCRCache
+from .ocr_checkpoint import (OCRCheckpoint, OCRJobManifest, input_fingerprint, MANIFEST_NAME,
+                             DEFAULT_MANIFEST_PATH, CHECKPOINT_SUFFIX)
+from .ocr_writers import create_ocr_writer, recover_partial_docx, FITZ_LOCK, PARTIAL_SUFFIX
 
-def ocr_pdf(input_path: str, output_dir: str, language: str, 
-           progress_callback=None, output_format: str = 'docx') -> str:
-    """OCR a PDF and save the result to a new file with proper formatting."""
-    if not os.path.exists(input_path):
-        raise FileNotFoundError(f"Input PDF {input_path} not found")
+# Output formats ocr_pdf can write; "pdf" adds an invisible text layer to a copy of the input
+OCR_OUTPUT_FORMATS = ("docx", "rtf", "pdf")
 
-    doc = fitz.open(input_path)
-    total_pages = len(doc)
+# OCR engines selectable in ocr_pdf; "auto" prefers tesserocr when installed
+OCR_ENGINES = ("auto", "tesserocr", "pytesseract")
 
-    # Choose output format
-    if output_format == 'docx':
-        document = Document()
-    elif output_format == 'rtf':
-        rtf_content = [r'{\rtf1\ansi\ansicpg1252\deff0\nouicompat{\fonttbl{\f0\fnil Arial;}}',
-                      r'{\colortbl ;\red0\green0\blue0;}',
-                      r'\viewkind4\uc1\pard\f0\fs24']
-    else:
-        raise ValueError("Unsupported format. Use 'docx' or 'rtf'")
+# Rasterization colorspaces; Tesseract only needs one channel so gray is cheapest
+OCR_COLORSPACES = ("gray", "rgb")
+DESKEW_MAX_ANGLE = 5.0  # Degrees searched either side of horizontal
+DESKEW_STEP = 0.5
 
-    if progress_callback:
-        progress_callback(0, total_pages)
-
-    for page_num in range(total_pages):
-        page = doc.load_page(page_num)
-        pix = page.get_pixmap()
-        img = Image.open(io.BytesIO(pix.tobytes("png")))
-        text = pytesseract.image_to_string(img, lang=language)
-
-        # Add text with pagination
-        if output_format == 'docx':
-            paragraph = document.add_paragraph(text)
-            if page_num < total_pages - 1:  # No page break after last page
-                paragraph.add_run().add_break(WD_BREAK.PAGE)
-        elif output_format == 'rtf':
-            rtf_content.append(text.replace('\n', '\\par '))
-            if page_num < total_pages - 1:
-                rtf_content.append(r'\page')
+# A page's own text layer is used instead of OCR when it has at least this
+# many non-whitespace characters and few undecodable glyphs
+TEXT_LAYER_MIN_CHARS = 50
+TEXT_LAYER_MAX_GARBAGE = 0.1
 
-        if progress_callback:
-            progress_callback(page_num + 1, total_pages)
+# Rendered pages waiting for recognition; each is a full-resolution image
+OCR_PREFETCH_PAGES = 2
+
+# Documents, engines and caches owned by the current worker process
+WORKER_MAX_OPEN_DOCS = 4  # Workers of a shared pool interleave pages of several files
+_worker_docs = {}
+_worker_engines = {}
+_worker_caches = {}
+
+# Pillow modes for the pixmap layouts MuPDF produces (channels, alpha)
+_PIXMAP_MODES = {
+    (1, False): "L",
+    (3, False): "RGB",
+    (4, True): "RGBA",
+    (4, False): "CMYK",
+}
+
+def pixmap_to_buffer(pix):
+    """
+    Raw view of a pixmap's samples for engines that take pixel buffers.
+    Returns (buffer, width, height, bytes_per_pixel, bytes_per_line).
+    """
+    # samples_mv is a zero-copy memoryview (PyMuPDF >= 1.18.17); samples copies
+    samples = getattr(pix, "samples_mv", None) or pix.samples
+    return samples, pix.width, pix.height, pix.n, pix.stride
+
+def pixmap_to_image(pix) -> Image.Image:
+    """
+    Wrap a pixmap's samples in a PIL image without the PNG encode/decode
+    round trip of Image.open(io.BytesIO(pix.tobytes("png"))).
+    """
+    mode = _PIXMAP_MODES.get((pix.n, bool(pix.alpha)))
+    if mode is None:
+        raise ValueError(f"Unsupported pixmap layout: {pix.n} channels, alpha={pix.alpha}")
+
+    samples, width, height, _, stride = pixmap_to_buffer(pix)
+    # frombuffer shares memory with the samples; copy() detaches the image
+    # from the pixmap so it stays valid after the pixmap is freed
+    return Image.frombuffer(mode, (width, height), samples, "raw", mode, stride, 1).copy()
+
+class PytesseractEngine:
+    """Fallback engine: starts a tesseract process (and reloads the model) per page."""
+    name = "pytesseract"
+
+    def __init__(self, language: str):
+        self.language = language
+        self._version = None
+
+    @property
+    def version(self) -> str:
+        if self._version is None:  # Each query runs "tesseract --version"
+            self._version = str(pytesseract.get_tesseract_version())
+        return self._version
+
+    def recognize(self, image: Image.Image) -> str:
+        return pytesseract.image_to_string(image, lang=self.language)
+
+    def recognize_words(self, image: Image.Image) -> list:
+        """Word boxes as [x0, y0, x1, y1, word] in image pixels."""
+        data = pytesseract.image_to_data(image, lang=self.language, output_type=pytesseract.Output.DICT)
+        words = []
+        for word, left, top, width, height in zip(data["text"], data["left"], data["top"],
+                                                  data["width"], data["height"]):
+            if word.strip():
+                words.append([left, top, left + width, top + height, word])
+        return words
+
+    def close(self):
+        pass
+
+class TesserocrEngine:
+    """Keeps one initialized Tesseract instance alive through the C API (tesserocr)."""
+    name = "tesserocr"
+
+    def __init__(self, language: str):
+        import tesserocr  # Optional dependency
+        self.language = language
+        self._tesserocr = tesserocr
+        self._api = tesserocr.PyTessBaseAPI(lang=language)
+
+    @property
+    def version(self) -> str:
+        return self._tesserocr.tesseract_version().splitlines()[0]
+
+    def _set_image(self, image: Image.Image):
+        if image.mode in ("L", "RGB"):
+            # Raw pixels straight into Tesseract, no intermediate image file
+            bpp = len(image.getbands())
+            self._api.SetImageBytes(image.tobytes(), image.width, image.height, bpp, image.width * bpp)
+        else:
+            self._api.SetImage(image)
+
+    def recognize(self, image: Image.Image) -> str:
+        self._set_image(image)
+        return self._api.GetUTF8Text()
+
+    def recognize_words(self, image: Image.Image) -> list:
+        """Word boxes as [x0, y0, x1, y1, word] in image pixels."""
+        self._set_image(image)
+        self._api.Recognize()
+        level = self._tesserocr.RIL.WORD
+        words = []
+        for item in self._tesserocr.iterate_level(self._api.GetIterator(), level):
+            word = item.GetUTF8Text(level)
+            box = item.BoundingBox(level)
+            if word and word.strip() and box:
+                words.append([*box, word])
+        return words
+
+    def close(self):
+        self._api.End()
+
+def create_ocr_engine(engine: str = "auto", language: str = "eng"):
+    """Create an OCR engine; "auto" falls back to pytesseract if tesserocr is unavailable."""
+    if engine not in OCR_ENGINES:
+        raise ValueError(f"Unknown OCR engine: {engine}. Use one of {OCR_ENGINES}")
+
+    if engine in ("auto", "tesserocr"):
+        try:
+            return TesserocrEngine(language)
+        except (ImportError, RuntimeError):
+            if engine == "tesserocr":
+                raise
+    return PytesseractEngine(language)
+
+def _otsu_threshold(gray: Image.Image) -> int:
+    """Global threshold that best separates ink from background (Otsu's method)."""
+    histogram = gray.histogram()
+    total = sum(histogram)
+    sum_all = sum(i * count for i, count in enumerate(histogram))
+
+    sum_background = 0
+    weight_background = 0
+    best_threshold, best_variance = 127, 0.0
+    for threshold, count in enumerate(histogram):
+        weight_background += count
+        if weight_background == 0:
+            continue
+        weight_foreground = total - weight_background
+        if weight_foreground == 0:
+            break
+        sum_background += threshold * count
+        mean_background = sum_background / weight_background
+        mean_foreground = (sum_all - sum_background) / weight_foreground
+        variance = weight_background * weight_foreground * (mean_background - mean_foreground) ** 2
+        if variance > best_variance:
+            best_threshold, best_variance = threshold, variance
+    return best_threshold
+
+def binarize_image(image: Image.Image) -> Image.Image:
+    """Black-and-white version of the page using an Otsu threshold."""
+    gray = image.convert("L")
+    threshold = _otsu_threshold(gray)
+    return gray.point(lambda p: 255 if p > threshold else 0)
+
+def _estimate_skew(gray: Image.Image) -> float:
+    """
+    Find the rotation that makes text lines horizontal by maximizing the
+    variance of the row-wise ink profile (searched on a downscaled copy).
+    """
+    scale = min(1.0, 800 / max(gray.size))
+    small = gray.resize((max(1, int(gray.width * scale)), max(1, int(gray.height * scale))))
+
+    best_angle, best_score = 0.0, -1.0
+    steps = int(DESKEW_MAX_ANGLE / DESKEW_STEP)
+    for step in range(-steps, steps + 1):
+        angle = step * DESKEW_STEP
+        rotated = small.rotate(angle, fillcolor=255)
+        # Averaging each row down to one pixel gives the horizontal projection profile
+        profile = rotated.resize((1, rotated.height), Image.BOX)
+        score = ImageStat.Stat(profile).var[0]
+        if score > best_score:
+            best_angle, best_score = angle, score
+    return best_angle
+
+def deskew_image(image: Image.Image, angle: float = None) -> Image.Image:
+    """Rotate the page so its text lines are horizontal (angle is estimated if not given)."""
+    if angle is None:
+        angle = _estimate_skew(image.convert("L"))
+    if angle == 0:
+        return image
+    fill = 255 if image.mode == "L" else (255,) * len(image.getbands())
+    return image.rotate(angle, resample=Image.BICUBIC, fillcolor=fill)
+
+def _rasterize_page(page, render: dict):
+    """
+    Render a page for OCR with the requested DPI, colorspace and preprocessing.
+    Returns (image, skew_angle) where skew_angle is the deskew rotation applied.
+    """
+    colorspace = fitz.csGRAY if render.get("colorspace") == "gray" else fitz.csRGB
+    pix = page.get_pixmap(dpi=render.get("dpi", 72), colorspace=colorspace, alpha=False)
+    image = pixmap_to_image(pix)
+    del pix  # The image owns a copy of the samples
+
+    angle = 0.0
+    if render.get("deskew"):
+        angle = _estimate_skew(image.convert("L"))
+        image = deskew_image(image, angle)
+    if render.get("binarize"):
+        image = binarize_image(image)
+    return image, angle
+
+def _words_to_page(words: list, image: Image.Image, angle: float, page_rect) -> list:
+    """
+    Map word boxes from OCR image pixels to page coordinates, undoing the
+    deskew rotation around the image centre (box sizes are kept).
+    """
+    scale_x = page_rect.width / image.width
+    scale_y = page_rect.height / image.height
+    center_x, center_y = image.width / 2, image.height / 2
+    cos_a, sin_a = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+
+    mapped = []
+    for x0, y0, x1, y1, word in words:
+        dx, dy = (x0 + x1) / 2 - center_x, (y0 + y1) / 2 - center_y
+        if angle:
+            dx, dy = dx * cos_a - dy * sin_a, dx * sin_a + dy * cos_a
+        half_w, half_h = (x1 - x0) / 2, (y1 - y0) / 2
+        mapped.append([(center_x + dx - half_w) * scale_x, (center_y + dy - half_h) * scale_y,
+                       (center_x + dx + half_w) * scale_x, (center_y + dy + half_h) * scale_y, word])
+    return mapped
+
+def _recognize_page(page, engine, render: dict, cache: OCRCache = None, words: bool = False):
+    """
+    Rasterize a single page and run the OCR engine on it, consulting the
+    cache first. Returns (result, served_from_cache) where result is the
+    page text, or with words=True a list of word boxes in page coordinates.
+    """
+    image, angle = _rasterize_page(page, render)
+    return _recognize_image(image, angle, page.rect, engine, render, cache, words)
+
+def _recognize_image(image: Image.Image, angle: float, page_rect, engine, render: dict,
+                     cache: OCRCache = None, words: bool = False):
+    """Recognition half of _recognize_page, for an image rendered by _rasterize_page."""
+    recognize = engine.recognize_words if words else engine.recognize
+
+    key = None
+    result = None
+    if cache is not None:
+        key = OCRCache.make_key(image, engine.language, render, engine.name, engine.version,
+                                variant="words" if words else "text")
+        result = cache.get(key)
+    cached = result is not None
+
+    if not cached:
+        result = recognize(image)
+        if key is not None:
+            cache.put(key, json.dumps(result) if words else result)
+    elif words:
+        result = json.loads(result)
+
+    if words:
+        result = _words_to_page(result, image, angle, page_rect)
+    return result, cached
+
+def _render_ahead(doc, page_nums, text_layer_pages: set, render: dict, words: bool, prefetch: int):
+    """
+    Render pages on a background thread while the caller recognizes earlier
+    ones. The queue holds at most prefetch pages, so the renderer blocks
+    when it gets that far ahead and memory stays bounded.
+
+    Yields (page_num, rendered, text): rendered is (image, skew_angle,
+    page_rect) for pages to OCR and None for text layer pages, whose text
+    is extracted here (None when words are wanted). The caller keeps using
+    fitz meanwhile (e.g. PDFTextLayerWriter), so each page is rendered
+    holding FITZ_LOCK.
+    """
+    pages = queue.Queue(maxsize=max(1, prefetch))
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for page_num in page_nums:
+                with FITZ_LOCK:
+                    page = doc.load_page(page_num)
+                    if page_num in text_layer_pages:
+                        item = (page_num, None, None if words else page.get_text("text"))
+                    else:
+                        image, angle = _rasterize_page(page, render)
+                        item = (page_num, (image, angle, page.rect), None)
+                if not put(item):
+                    return
+        except Exception as e:
+            put(e)
+        else:
+            put(None)  # End of pages
+
+    thread = threading.Thread(target=produce, name="ocr-render", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = pages.get()
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # Unblocks and ends the renderer when the consumer stops early
+        stop.set()
+        thread.join()
+
+def _text_layer_text(page, min_chars: int = TEXT_LAYER_MIN_CHARS):
+    """Return the page's extractable text if it is usable, otherwise None."""
+    text = page.get_text("text")
+    visible = "".join(text.split())
+    if len(visible) < min_chars:
+        return None
+
+    # Fonts without a usable ToUnicode map extract as U+FFFD or control chars
+    garbage = sum(1 for ch in visible if ch == "\ufffd" or not ch.isprintable())
+    if garbage / len(visible) > TEXT_LAYER_MAX_GARBAGE:
+        return None
+    return text
+
+def _get_worker_engine(engine: str, language: str):
+    """One long-lived engine per worker process and language."""
+    key = (engine, language)
+    if key not in _worker_engines:
+        _worker_engines[key] = create_ocr_engine(engine, language)
+    return _worker_engines[key]
+
+def _open_worker_document(input_path: str):
+    """Open (or reuse) the document inside a worker process."""
+    doc = _worker_docs.pop(input_path, None)
+    if doc is None:
+        # Keep the most recently used documents open, close the oldest
+        while len(_worker_docs) >= WORKER_MAX_OPEN_DOCS:
+            oldest = next(iter(_worker_docs))
+            _worker_docs.pop(oldest).close()
+        doc = fitz.open(input_path)
+    _worker_docs[input_path] = doc  # Re-inserted last: dict order is the LRU order
+    return doc
+
+def create_page_executor(workers: int) -> ProcessPoolExecutor:
+    """
+    Process pool for recognizing pages, to be shared by several ocr_pdf calls
+    (see its executor parameter) so that files OCRed concurrently draw from
+    one worker budget and workers keep their engines loaded between files.
+    """
+    return ProcessPoolExecutor(max_workers=max(1, workers))
+
+def _get_worker_cache(cache_config):
+    """One cache connection per worker process and cache file."""
+    if cache_config is None:
+        return None
+    if cache_config not in _worker_caches:
+        path, max_bytes = cache_config
+        _worker_caches[cache_config] = OCRCache(path, max_bytes)
+    return _worker_caches[cache_config]
+
+def _ocr_page_task(input_path: str, page_num: int, language: str, engine: str, render: dict,
+                   cache_config=None, words: bool = False):
+    """Process pool entry point: returns (page_num, result, served_from_cache)."""
+    doc = _open_worker_document(input_path)
+    ocr_engine = _get_worker_engine(engine, language)
+    cache = _get_worker_cache(cache_config)
+    result, cached = _recognize_page(doc.load_page(page_num), ocr_engine, render, cache, words)
+    return page_num, result, cached
+
+def ocr_pdf(input_path: str, output_dir: str, language: str,
+           progress_callback=None, output_format: str = 'docx',
+           workers: int = 1, engine: str = "auto",
+           dpi: int = 72, colorspace: str = "rgb",
+           binarize: bool = False, deskew: bool = False,
+           use_text_layer: bool = False, stats: dict = None,
+           cache: OCRCache = None, resume: bool = False,
+           prefetch: int = OCR_PREFETCH_PAGES, executor=None) -> str:
+    """
+    OCR a PDF and save the result to a new file with proper formatting.
+
+    Rendering overlaps recognition: with workers <= 1 a render thread stays
+    up to prefetch pages ahead of the OCR engine. With workers > 1 pages are
+    rasterized and recognized in a process pool with at most workers +
+    prefetch pages in flight; the output is still assembled in page order
+    and progress_callback fires once per completed page. Passing an
+    executor from create_page_executor() sends pages to that shared pool
+    instead (workers then only sizes this file's share of in-flight pages);
+    the caller owns and shuts down the pool. engine selects the OCR backend (see OCR_ENGINES);
+    each worker keeps its engine initialized across pages.
+
+    Pages are rendered at dpi in the given colorspace ("gray" or "rgb") and
+    can optionally be deskewed and binarized before recognition.
+
+    With use_text_layer, pages that already carry extractable text are
+    written as-is without rasterizing or OCR. If a stats dict is given it is
+    filled with per-run page counts (pages_total, pages_text_layer, pages_ocr,
+    pages_cached).
+
+    An OCRCache lets pages whose rendered image was recognized before (with
+    the same language, render settings and engine version) skip the engine.
+
+    Pages are streamed to the output file as they complete. If the run fails
+    the pages written so far are kept: RTF output stays a valid document and
+    DOCX output is left as "<output>.part". The next run for the same output
+    turns that file into OCR_<name>_recovered.docx before starting over
+    (stats gets recovered_path), unless it resumes from a checkpoint, which
+    rebuilds those pages itself.
+
+    output_format='pdf' writes a searchable copy of the input: recognized
+    words are placed as invisible text over the original pages, whose image
+    streams are copied unchanged. Pages with a usable text layer are left
+    as they are.
+
+    With resume, every written page is checkpointed next to the output and
+    the job is tracked in an OCRJobManifest next to the cache (or in the
+    default cache folder without one). A rerun with the
+    same input and settings rebuilds the output from the checkpoint and
+    continues after the last completed page (stats gets pages_resumed);
+    a job that already finished is returned straight away without opening
+    the PDF (stats gets already_complete).
+
+    Several files may be OCRed at once on threads of one process: every
+    fitz call made here holds FITZ_LOCK, while rasterizing in the page pool
+    and recognition run unlocked.
+    """
+    if not os.path.exists(input_path):
+        raise FileNotFoundError(f"Input PDF {input_path} not found")
+    if colorspace not in OCR_COLORSPACES:
+        raise ValueError(f"Unsupported colorspace: {colorspace}. Use one of {OCR_COLORSPACES}")
+    if output_format not in OCR_OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported format: {output_format}. Use one of {OCR_OUTPUT_FORMATS}")
+
+    render = {"dpi": dpi, "colorspace": colorspace, "binarize": binarize, "deskew": deskew}
 
     # Generate output path
     base_name = os.path.splitext(os.path.basename(input_path))[0]
     output_filename = f"OCR_{base_name}.{output_format}"
     output_path = os.path.join(output_dir, output_filename)
 
-    # Save the document
-    if output_format == 'docx':
-        document.save(output_path)
-    elif output_format == 'rtf':
-        rtf_content.append('}')
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(rtf_content))
+    settings = {"language": language, "output_format": output_format, "engine": engine,
+                "render": render, "use_text_layer": use_text_layer}
+    manifest_path = os.path.join(os.path.dirname(cache.path), MANIFEST_NAME) if cache else DEFAULT_MANIFEST_PATH
+    if resume:
+        manifest = OCRJobManifest(manifest_path)
+        complete = manifest.is_complete(input_path, output_path, settings)
+        manifest.close()
+        if complete:
+            if stats is not None:
+                stats.update({"pages_text_layer": 0, "pages_ocr": 0, "pages_cached": 0,
+                              "pages_resumed": 0, "already_complete": True})
+            return output_path
+
+    # The new writer would truncate a .part left by a run that died without a checkpoint
+    part_path = output_path + PARTIAL_SUFFIX
+    if (output_format == 'docx' and os.path.exists(part_path)
+            and not (resume and os.path.exists(output_path + CHECKPOINT_SUFFIX))):
+        recovered_path = os.path.join(output_dir, f"OCR_{base_name}_recovered.docx")
+        recover_partial_docx(output_path, recovered_path)
+        logging.warning(f"Recovered the pages of an interrupted run into {recovered_path}")
+        if stats is not None:
+            stats["recovered_path"] = recovered_path
+
+    with FITZ_LOCK:
+        doc = fitz.open(input_path)
+        total_pages = len(doc)
+
+    # Pages go to disk as soon as they are in order, so memory does not grow with page count
+    writer = create_ocr_writer(output_format, output_path, input_path)
+    words = output_format == 'pdf'  # Searchable PDFs need word positions, not just text
+    checkpoint = OCRCheckpoint(output_path, input_fingerprint(input_path), settings) if resume else None
+    manifest = OCRJobManifest(manifest_path) if resume else None
+
+    def write_output(result):
+        if words:
+            writer.write_page(None, words=result)  # None leaves text layer pages untouched
+        else:
+            writer.write_page(result)
+
+    def add_page_text(page_num, result):
+        if result is None and not words:  # Text layer page; extracted again rather than held since the pre-pass
+            with FITZ_LOCK:
+                result = doc.load_page(page_num).get_text("text")
+        write_output(result)
+        if checkpoint:
+            checkpoint.record(page_num, result)
+
+    try:
+        # Rebuild the output from an earlier interrupted run, without rendering anything
+        start_page = 0
+        if checkpoint:
+            start_page = checkpoint.replay(lambda page_num, result: write_output(result))
+            manifest.update(input_path, settings, output_path, "running", start_page, total_pages)
+
+        if progress_callback:
+            progress_callback(start_page, total_pages)
+
+        # Pre-pass: pages with a usable text layer skip rasterization and OCR
+        text_layer_pages = set()
+        if use_text_layer:
+            for page_num in range(start_page, total_pages):
+                with FITZ_LOCK:
+                    usable = _text_layer_text(doc.load_page(page_num)) is not None
+                if usable:
+                    text_layer_pages.add(page_num)
+        ocr_pages = [p for p in range(start_page, total_pages) if p not in text_layer_pages]
+
+        pages_cached = 0
+        if not ocr_pages or (executor is None and workers <= 1):
+            ocr_engine = create_ocr_engine(engine, language) if ocr_pages else None
+            pages = _render_ahead(doc, range(start_page, total_pages), text_layer_pages, render, words, prefetch)
+            try:
+                for page_num, rendered, text in pages:
+                    if rendered is not None:
+                        text, cached = _recognize_image(*rendered, ocr_engine, render, cache, words)
+                        pages_cached += cached
+                    add_page_text(page_num, text)
+
+                    if progress_callback:
+                        progress_callback(page_num + 1, total_pages)
+            finally:
+                pages.close()
+                if ocr_engine:
+                    ocr_engine.close()
+        else:
+            cache_config = (cache.path, cache.max_bytes) if cache else None
+            pages_cached = _ocr_pages_parallel(
+                input_path, language, engine, render, cache_config, total_pages, workers,
+                ocr_pages, dict.fromkeys(text_layer_pages), add_page_text, progress_callback, words,
+                first_page=start_page, max_in_flight=max(1, workers) + max(1, prefetch),
+                executor=executor)
 
-    doc.close()
+        if stats is not None:
+            stats.update({
+                "pages_total": total_pages,
+                "pages_text_layer": len(text_layer_pages),
+                "pages_ocr": len(ocr_pages) - pages_cached,
+                "pages_cached": pages_cached,
+                "pages_resumed": start_page
+            })
+        writer.close()
+        if checkpoint:
+            checkpoint.remove()
+            manifest.update(input_path, settings, output_path, "done", total_pages, total_pages)
+    except BaseException:
+        # Keep what was written so far (a .part is recovered by the next run)
+        writer.abort()
+        if checkpoint:
+            checkpoint.close()
+            manifest.update(input_path, settings, output_path, "failed", writer.pages_written, total_pages)
+        raise
+    finally:
+        with FITZ_LOCK:
+            doc.close()
+        if manifest:
+            manifest.close()
 
     if progress_callback:
         progress_callback(total_pages, total_pages)
 
     return output_path
+
+def _ocr_pages_parallel(input_path, language, engine, render, cache_config, total_pages, workers,
+                        ocr_pages, known_pages, add_page_text, progress_callback=None,
+                        words=False, first_page=0, max_in_flight=None, executor=None) -> int:
+    """
+    Fan ocr_pages out to a process pool and hand results back in page order,
+    starting at first_page. known_pages maps page numbers that need no OCR
+    to their text (None lets add_page_text fetch it).
+
+    Pages are submitted lazily: at most max_in_flight pages are queued,
+    running or finished but waiting for an earlier page, so a slow page
+    cannot let results pile up in memory. A shared executor is used as is;
+    otherwise a pool of workers processes is created for this call.
+    Returns the number of pages served from the cache.
+    """
+    if max_in_flight is None:
+        max_in_flight = len(ocr_pages)
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=min(workers, len(ocr_pages)))
+    finished = False
+    pages_cached = 0
+    in_flight = set()
+    try:
+        known = dict(known_pages)
+        results = {}  # Recognized pages waiting for their predecessors
+        next_page = first_page
+
+        def flush():
+            nonlocal next_page
+            while True:
+                if next_page in known:
+                    add_page_text(next_page, known.pop(next_page))
+                elif next_page in results:
+                    add_page_text(next_page, results.pop(next_page))
+                else:
+                    break
+                next_page += 1
+
+        flush()
+        completed = first_page + len(known_pages)
+        if progress_callback and len(known_pages):
+            progress_callback(completed, total_pages)
+
+        remaining = iter(ocr_pages)
+        while True:
+            # Pages go out in order, so the next page to write is always in flight or done
+            while len(in_flight) + len(results) < max(1, max_in_flight):
+                page_num = next(remaining, None)
+                if page_num is None:
+                    break
+                in_flight.add(executor.submit(_ocr_page_task, input_path, page_num, language, engine,
+                                              render, cache_config, words))
+            if not in_flight:
+                break
+
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                page_num, result, cached = future.result()
+                pages_cached += cached
+                results[page_num] = result
+                flush()
+
+                completed += 1
+                if progress_callback:
+                    progress_callback(completed, total_pages)
+        finished = True
+    finally:
+        # On error or cancellation drop the pages that have not started yet
+        if own_executor:
+            executor.shutdown(wait=finished, cancel_futures=not finished)
+        elif not finished:
+            for future in in_flight:
+                future.cancel()
+    return pages_cached
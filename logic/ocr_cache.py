@@ -0,0 +1,146 @@
+# logic/ocr_cache.py
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".pdftools", "ocr_cache.sqlite3")
+DEFAULT_CACHE_MAX_MB = 512
+EVICT_TO = 0.9  # Eviction trims the cache to this share of max_bytes, so it runs once per batch of puts
+TOUCH_BATCH = 100  # Cache hits whose last_used update is written in one transaction
+
+class OCRCache:
+    """
+    Content-addressed OCR result cache stored in SQLite.
+
+    Entries are keyed by a hash of the rendered page image plus the language,
+    render settings and engine version, so a page is only recognized again
+    when something that affects the result changes. The cache is trimmed to
+    max_bytes by evicting the least recently used entries.
+
+    The size of the cache is tracked in memory and only summed in SQLite
+    when it looks over budget (other processes may have added entries).
+    Hits are recorded in memory and written TOUCH_BATCH at a time, before
+    an eviction, or on close().
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_CACHE_MAX_MB * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        # Several worker processes may share the file; WAL lets readers run during writes
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ocr_cache ("
+            " key TEXT PRIMARY KEY,"
+            " text TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_ocr_cache_last_used ON ocr_cache(last_used)")
+        self._conn.commit()
+        self._total = self._stored_size()
+        self._touched = {}  # key -> last_used not yet written
+
+    @staticmethod
+    def make_key(image, language: str, render: dict, engine_name: str, engine_version: str,
+                 variant: str = "text") -> str:
+        """
+        Hash of the page pixels and everything else that changes the recognized text.
+        variant separates result kinds for the same page ("text" or "words").
+        """
+        digest = hashlib.sha256()
+        digest.update(f"{image.mode}:{image.width}x{image.height}:".encode())
+        digest.update(image.tobytes())
+        settings = json.dumps({
+            "language": language,
+            "render": render,
+            "engine": engine_name,
+            "engine_version": engine_version
+        }, sort_keys=True)
+        if variant != "text":  # Keeps plain text keys identical to earlier versions
+            settings += f":{variant}"
+        digest.update(settings.encode())
+        return digest.hexdigest()
+
+    def get(self, key: str):
+        """Return the cached text for key (marking it recently used) or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT text FROM ocr_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._touched[key] = time.time()
+            if len(self._touched) >= TOUCH_BATCH:
+                self._write_touched()
+                self._conn.commit()
+            return row[0]
+
+    def put(self, key: str, text: str):
+        """Store text for key and evict old entries if the cache is over budget."""
+        size = len(text.encode("utf-8")) + len(key)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ocr_cache (key, text, size, last_used) VALUES (?, ?, ?, ?)",
+                (key, text, size, time.time())
+            )
+            self._total += size
+            if self._total > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _stored_size(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM ocr_cache").fetchone()[0]
+
+    def _write_touched(self):
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE ocr_cache SET last_used = ? WHERE key = ?",
+                [(last_used, key) for key, last_used in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def _evict(self):
+        """Delete least recently used entries until the cache is down to EVICT_TO of max_bytes."""
+        self._write_touched()  # Recent hits must not be evicted
+        self._total = self._stored_size()
+        excess = self._total - int(self.max_bytes * EVICT_TO)
+        if self._total <= self.max_bytes or excess <= 0:
+            return
+
+        freed = 0
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM ocr_cache ORDER BY last_used"):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany("DELETE FROM ocr_cache WHERE key = ?", victims)
+        self._total -= freed
+        logging.info(f"OCR cache: evicted {len(victims)} entries ({freed / 1024:.1f} KB)")
+
+    def size_bytes(self) -> int:
+        with self._lock:
+            self._total = self._stored_size()
+            return self._total
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM ocr_cache")
+            self._conn.commit()
+            self._touched.clear()
+            self._total = 0
+
+    def close(self):
+        with self._lock:
+            self._write_touched()
+            self._conn.commit()
+            self._conn.close()
@@ -0,0 +1,159 @@
+# logic/ocr_checkpoint.py
+import json
+import os
+import sqlite3
+import threading
+import time
+from .ocr_cache import DEFAULT_CACHE_PATH
+
+CHECKPOINT_SUFFIX = ".ckpt.jsonl"
+MANIFEST_NAME = "ocr_jobs.sqlite3"
+DEFAULT_MANIFEST_PATH = os.path.join(os.path.dirname(DEFAULT_CACHE_PATH), MANIFEST_NAME)
+
+def input_fingerprint(input_path: str) -> str:
+    """Cheap identity of an input file (size and modification time), no reading required."""
+    stat = os.stat(input_path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+class OCRCheckpoint:
+    """
+    Per-page OCR results of one output file, appended to
+    "<output>.ckpt.jsonl" as pages are written.
+
+    The first line records the input fingerprint and OCR settings; a
+    checkpoint written for a different input or different settings is
+    discarded. Pages are recorded in page order, so a checkpoint always
+    holds pages 0..n-1 and resuming continues at page n.
+    """
+
+    def __init__(self, output_path: str, fingerprint: str, settings: dict):
+        self.path = output_path + CHECKPOINT_SUFFIX
+        self.header = {"input": fingerprint, "settings": settings}
+        self._file = None
+
+    def replay(self, write_page) -> int:
+        """
+        Feed the checkpointed pages to write_page(page_num, result) in order
+        and open the checkpoint for appending. Returns the number of pages
+        replayed (the page to resume from).
+        """
+        pages = 0
+        valid_end = 0
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as f:
+                header = self._read_record(f.readline())
+                if header == self.header:
+                    valid_end = f.tell()
+                    for line in f:
+                        record = self._read_record(line)
+                        # Stop at a torn last line or a gap
+                        if record is None or record.get("page") != pages:
+                            break
+                        write_page(pages, record.get("result"))
+                        pages += 1
+                        valid_end = f.tell()
+
+        if valid_end:
+            self._file = open(self.path, 'r+', encoding='utf-8')
+            self._file.truncate(valid_end)
+            self._file.seek(valid_end)
+        else:
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self._write(self.header)
+        return pages
+
+    @staticmethod
+    def _read_record(line: bytes):
+        if not line.endswith(b"\n"):
+            return None
+        try:
+            return json.loads(line)
+        except ValueError:
+            return None
+
+    def _write(self, record: dict):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def record(self, page_num: int, result):
+        """Append the result of the next page in order."""
+        self._write({"page": page_num, "result": result})
+
+    def close(self):
+        """Close the file, keeping it for the next run."""
+        if self._file and not self._file.closed:
+            self._file.close()
+
+    def remove(self):
+        """Delete the checkpoint once its output is complete."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+class OCRJobManifest:
+    """
+    Status of every OCR job, stored in SQLite next to the OCR cache (not in
+    the users' output folders) so processes working on different files can
+    share it.
+
+    A job is identified by its input and output paths. It is complete when
+    it finished with the same input fingerprint and settings and its output
+    still exists; such files are skipped without being opened.
+    """
+
+    def __init__(self, path: str = DEFAULT_MANIFEST_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ocr_jobs ("
+            " input TEXT NOT NULL,"
+            " fingerprint TEXT NOT NULL,"
+            " settings TEXT NOT NULL,"
+            " output TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " pages_done INTEGER NOT NULL,"
+            " pages_total INTEGER NOT NULL,"
+            " updated REAL NOT NULL,"
+            " PRIMARY KEY (input, output))"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _settings_json(settings: dict) -> str:
+        return json.dumps(settings, sort_keys=True)
+
+    def is_complete(self, input_path: str, output_path: str, settings: dict) -> bool:
+        """Whether input_path was fully OCRed into output_path with these settings and still is."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprint, settings, status FROM ocr_jobs WHERE input = ? AND output = ?",
+                (os.path.abspath(input_path), os.path.abspath(output_path))
+            ).fetchone()
+        if row is None:
+            return False
+        fingerprint, stored_settings, status = row
+        return (status == "done" and fingerprint == input_fingerprint(input_path)
+                and stored_settings == self._settings_json(settings) and os.path.exists(output_path))
+
+    def update(self, input_path: str, settings: dict, output_path: str, status: str,
+               pages_done: int, pages_total: int):
+        """Record a job's status ("running", "failed" or "done") and page progress."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ocr_jobs"
+                " (input, fingerprint, settings, output, status, pages_done, pages_total, updated)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (os.path.abspath(input_path), input_fingerprint(input_path), self._settings_json(settings),
+                 os.path.abspath(output_path), status, pages_done, pages_total, time.time())
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
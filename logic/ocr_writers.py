@@ -0,0 +1,344 @@
+# logic/ocr_writers.py
+import os
+import logging
+import re
+import shutil
+import threading
+import zipfile
+from xml.sax.saxutils import escape
+
+import fitz  # PyMuPDF
+
+# PyMuPDF is not thread-safe, even across separate documents. Code that may
+# call fitz from more than one thread of a process (OCR, the optimized split
+# engine) holds this lock for each call.
+FITZ_LOCK = threading.RLock()
+
+# Characters XML 1.0 does not allow (Tesseract ends each page with a form feed)
+_XML_INVALID = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+PARTIAL_SUFFIX = ".part"
+
+class RTFStreamWriter:
+    """Writes OCR pages to an RTF file as they complete, flushing after each page."""
+
+    HEADER = (r'{\rtf1\ansi\ansicpg1252\deff0\nouicompat{\fonttbl{\f0\fnil Arial;}}' '\n'
+              r'{\colortbl ;\red0\green0\blue0;}' '\n'
+              r'\viewkind4\uc1\pard\f0\fs24' '\n')
+
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self.pages_written = 0
+        # ASCII only: everything else is written as \uN? escapes
+        self._file = open(output_path, 'w', encoding='ascii', newline='\n')
+        self._file.write(self.HEADER)
+
+    @staticmethod
+    def escape(text: str) -> str:
+        """Escape RTF control characters and encode non-ASCII as \\uN? sequences."""
+        parts = []
+        for ch in _XML_INVALID.sub('', text):
+            code = ord(ch)
+            if ch in '\\{}':
+                parts.append('\\' + ch)
+            elif ch == '\n':
+                parts.append('\\par ')
+            elif ch == '\t':
+                parts.append('\\tab ')
+            elif code < 128:
+                parts.append(ch)
+            elif code <= 0xFFFF:
+                # RTF \u takes a signed 16-bit value
+                parts.append(f'\\u{code - 0x10000 if code > 0x7FFF else code}?')
+            else:
+                code -= 0x10000
+                for unit in (0xD800 + (code >> 10), 0xDC00 + (code & 0x3FF)):
+                    parts.append(f'\\u{unit - 0x10000}?')
+        return ''.join(parts)
+
+    def write_page(self, text: str):
+        if self.pages_written:
+            self._file.write('\\page\n')
+        self._file.write(self.escape(text) + '\n')
+        self._file.flush()
+        self.pages_written += 1
+
+    def close(self):
+        self._file.write('}')
+        self._file.close()
+
+    def abort(self):
+        """Close the file keeping the pages written so far as a valid RTF."""
+        if not self._file.closed:
+            self.close()
+
+class DocxStreamWriter:
+    """
+    Writes OCR pages to a DOCX without holding the document in memory.
+
+    Page paragraphs are appended to "<output>.part" as WordprocessingML and
+    flushed after every page. close() streams that fragment into the
+    word/document.xml part of the final package and removes it. If a run
+    dies midway the .part file remains and recover_partial_docx() turns it
+    into a readable document.
+    """
+
+    CONTENT_TYPES = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        '<Override PartName="/word/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+        '</Types>'
+    )
+    PACKAGE_RELS = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="word/document.xml"/>'
+        '</Relationships>'
+    )
+    DOCUMENT_RELS = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+        'Target="styles.xml"/>'
+        '</Relationships>'
+    )
+    STYLES = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<w:styles xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        '<w:docDefaults><w:rPrDefault><w:rPr>'
+        '<w:rFonts w:ascii="Calibri" w:hAnsi="Calibri" w:cs="Calibri"/><w:sz w:val="22"/>'
+        '</w:rPr></w:rPrDefault></w:docDefaults>'
+        '</w:styles>'
+    )
+    DOCUMENT_HEADER = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+    )
+    DOCUMENT_FOOTER = (
+        '<w:sectPr><w:pgSz w:w="11906" w:h="16838"/>'
+        '<w:pgMar w:top="1440" w:right="1440" w:bottom="1440" w:left="1440" '
+        'w:header="708" w:footer="708" w:gutter="0"/></w:sectPr>'
+        '</w:body></w:document>'
+    )
+
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self.part_path = output_path + PARTIAL_SUFFIX
+        self.pages_written = 0
+        self._part = open(self.part_path, 'w', encoding='utf-8')
+
+    @staticmethod
+    def page_xml(text: str, page_break: bool) -> str:
+        """One paragraph per page, lines separated by breaks (as python-docx does)."""
+        runs = ['<w:r><w:br w:type="page"/></w:r>'] if page_break else []
+        content = []
+        for index, line in enumerate(_XML_INVALID.sub('', text).split('\n')):
+            if index:
+                content.append('<w:br/>')
+            for chunk_index, chunk in enumerate(line.split('\t')):
+                if chunk_index:
+                    content.append('<w:tab/>')
+                if chunk:
+                    content.append(f'<w:t xml:space="preserve">{escape(chunk)}</w:t>')
+        runs.append(f'<w:r>{"".join(content)}</w:r>')
+        return f'<w:p>{"".join(runs)}</w:p>\n'
+
+    def write_page(self, text: str):
+        self._part.write(self.page_xml(text, page_break=self.pages_written > 0))
+        self._part.flush()
+        self.pages_written += 1
+
+    def close(self):
+        self._part.close()
+        self.assemble(self.part_path, self.output_path)
+        os.remove(self.part_path)
+
+    def abort(self):
+        """Stop writing and keep the .part file for recovery."""
+        if not self._part.closed:
+            self._part.close()
+
+    @classmethod
+    def assemble(cls, part_path: str, output_path: str):
+        """Build the DOCX package, streaming the body fragment in chunks."""
+        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as package:
+            package.writestr('[Content_Types].xml', cls.CONTENT_TYPES)
+            package.writestr('_rels/.rels', cls.PACKAGE_RELS)
+            package.writestr('word/_rels/document.xml.rels', cls.DOCUMENT_RELS)
+            package.writestr('word/styles.xml', cls.STYLES)
+            with package.open('word/document.xml', 'w', force_zip64=True) as document, \
+                    open(part_path, 'rb') as part:
+                document.write(cls.DOCUMENT_HEADER.encode('utf-8'))
+                shutil.copyfileobj(part, document, 1024 * 1024)
+                document.write(cls.DOCUMENT_FOOTER.encode('utf-8'))
+
+def recover_partial_docx(output_path: str, recovered_path: str = None) -> bool:
+    """
+    Turn the .part file left by an interrupted DOCX run for output_path into
+    a document at recovered_path (output_path by default).
+    """
+    part_path = output_path + PARTIAL_SUFFIX
+    if not os.path.exists(part_path):
+        return False
+
+    # Drop a trailing paragraph that was only partly written
+    with open(part_path, 'rb+') as part:
+        data_end = part.seek(0, os.SEEK_END)
+        part.seek(max(0, data_end - 1024 * 1024))
+        tail = part.read()
+        last_complete = tail.rfind(b'</w:p>\n')
+        if last_complete >= 0:
+            part.truncate(data_end - len(tail) + last_complete + len(b'</w:p>\n'))
+
+    DocxStreamWriter.assemble(part_path, recovered_path or output_path)
+    os.remove(part_path)
+    return True
+
+class PDFTextLayerWriter:
+    """
+    Writes OCR words as invisible text (render mode 3) over the pages of a
+    copy of the input PDF.
+
+    The input is copied byte for byte and only changed through incremental
+    saves, so page images are never decoded or re-encoded. Work is saved
+    every SAVE_EVERY pages, which also leaves a usable partial result.
+    Word boxes are given in page coordinates as [x0, y0, x1, y1, word].
+
+    The text uses an embedded Unicode font (Noto Sans, or MuPDF's built-in
+    Noto Serif without pymupdf-fonts), with Droid Sans Fallback for CJK
+    words; Base-14 Helvetica cannot encode ș/ț or non-Latin scripts. The
+    fonts are embedded whole while pages are added, so close() subsets
+    them to the glyphs used and writes the file once more in full, which
+    drops the whole fonts the incremental saves carried (about 4 MB with
+    the CJK font) and compresses the subsets. Page images are copied as
+    they are.
+    """
+
+    SAVE_EVERY = 25
+    FONT = "ocrtext"
+    CJK_FONT = "ocrcjk"
+    _fonts = None
+
+    def __init__(self, input_path: str, output_path: str):
+        self.output_path = output_path
+        self.pages_written = 0
+        shutil.copyfile(input_path, output_path)
+        with FITZ_LOCK:
+            self._doc = fitz.open(output_path)
+            self._incremental = self._doc.can_save_incrementally()
+        self._unsaved = False
+        self._fonts_embedded = False
+
+    @classmethod
+    def _load_fonts(cls) -> dict:
+        """Font name -> fitz.Font, loaded once per process."""
+        if cls._fonts is None:
+            try:
+                text_font = fitz.Font("notos")  # Needs pymupdf-fonts
+            except Exception:
+                text_font = fitz.Font()  # Built-in Noto Serif
+            fonts = {cls.FONT: text_font}
+            try:
+                fonts[cls.CJK_FONT] = fitz.Font("cjk")
+            except Exception as e:
+                logging.warning(f"No CJK font in this PyMuPDF build; CJK words may not be searchable: {str(e)}")
+            cls._fonts = fonts
+        return cls._fonts
+
+    def _font_for(self, word: str) -> str:
+        fonts = self._load_fonts()
+        cjk = fonts.get(self.CJK_FONT)
+        if cjk is not None and not all(fonts[self.FONT].has_glyph(ord(c)) for c in word):
+            if all(cjk.has_glyph(ord(c)) for c in word):
+                return self.CJK_FONT
+        return self.FONT
+
+    def write_page(self, text, words: list = None):
+        """Add the words to the next page; without words the page is left unchanged."""
+        with FITZ_LOCK:
+            if words:
+                self._add_words(self._doc.load_page(self.pages_written), words)
+                self._unsaved = True
+            self.pages_written += 1
+            if self._incremental and self._unsaved and self.pages_written % self.SAVE_EVERY == 0:
+                self._save()
+
+    def _add_words(self, page, words: list):
+        shape = page.new_shape()
+        # Boxes are in the rotated (displayed) page; text is drawn in unrotated space
+        to_unrotated = page.derotation_matrix
+        sideways = page.rotation in (90, 270)
+        fonts = self._load_fonts()
+        inserted = set()
+        for x0, y0, x1, y1, word in words:
+            width, height = x1 - x0, y1 - y0
+            if width <= 0 or height <= 0:
+                continue
+            fontname = self._font_for(word)
+            length = fonts[fontname].text_length(word, fontsize=height)
+            if not length:
+                continue
+            if fontname not in inserted:
+                # The font file is embedded once; later pages only reference it
+                page.insert_font(fontname=fontname, fontbuffer=fonts[fontname].buffer)
+                inserted.add(fontname)
+                self._fonts_embedded = True
+            # Baseline near the bottom of the box, stretched to the box width
+            origin = fitz.Point(x0, y1 - height * 0.2) * to_unrotated
+            stretch = width / length
+            morph = (origin, fitz.Matrix(1, stretch) if sideways else fitz.Matrix(stretch, 1))
+            shape.insert_text(origin, word, fontname=fontname, fontsize=height,
+                              render_mode=3, rotate=page.rotation, morph=morph)
+        shape.commit()
+
+    def _save(self):
+        self._doc.saveIncr()
+        self._unsaved = False
+
+    def close(self):
+        with FITZ_LOCK:
+            if self._fonts_embedded:
+                try:
+                    self._doc.subset_fonts()
+                except Exception as e:
+                    # The file is still written, with its fonts whole
+                    logging.warning(f"Could not subset the OCR text fonts of {os.path.basename(self.output_path)}: {str(e)}")
+                self._save_full(garbage=1, deflate_fonts=True)  # garbage=1 drops the whole fonts
+            elif not self._unsaved:
+                self._doc.close()
+            elif self._incremental:
+                self._save()
+                self._doc.close()
+            else:
+                # Repaired or encrypted inputs cannot be appended to; write a full copy instead
+                self._save_full()
+
+    def _save_full(self, **options):
+        temp_path = self.output_path + PARTIAL_SUFFIX
+        self._doc.save(temp_path, **options)
+        self._doc.close()
+        os.replace(temp_path, self.output_path)
+
+    def abort(self):
+        """Save the pages finished so far and close the document."""
+        with FITZ_LOCK:
+            if not self._doc.is_closed:
+                self.close()
+
+def create_ocr_writer(output_format: str, output_path: str, input_path: str = None):
+    """Incremental writer for the given OCR output format."""
+    if output_format == 'docx':
+        return DocxStreamWriter(output_path)
+    if output_format == 'rtf':
+        return RTFStreamWriter(output_path)
+    if output_format == 'pdf':
+        return PDFTextLayerWriter(input_path, output_path)
+    raise ValueError("Unsupported format. Use 'docx', 'rtf' or 'pdf'")
@@ -0,0 +1,132 @@
+# logic/progress.py
+import math
+import threading
+import time
+
+class ThroughputEstimator:
+    """
+    Live throughput and ETA for long operations (OCR, split, compression, merge).
+
+    Progress is reported as cumulative work done, in units (pages or files)
+    and optionally bytes. The rate is an exponentially smoothed average whose
+    weight depends on the time between samples, so bursts of cheap pages do
+    not swing the ETA as much as a plain elapsed / done average. When a byte
+    total is known the ETA is based on bytes, which weights large files and
+    image-heavy work by their size; otherwise on units.
+
+    Time spent between pause() and resume() is excluded. Thread-safe.
+    """
+
+    def __init__(self, total_units: float = 0, total_bytes: float = 0,
+                 unit: str = "pages", smoothing: float = 10.0, min_interval: float = 0.25,
+                 clock=time.monotonic):
+        self.total_units = total_units
+        self.total_bytes = total_bytes
+        self.unit = unit
+        self.smoothing = smoothing  # Seconds over which older samples fade out
+        self.min_interval = min_interval  # Shorter gaps are accumulated, not sampled
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.units_done = 0.0
+            self.bytes_done = 0.0
+            self._unit_rate = None
+            self._byte_rate = None
+            self._start = self._clock()
+            self._paused_total = 0.0
+            self._pause_start = None
+            self._sample_time = 0.0  # Active (unpaused) seconds at the last sample
+            self._sample_units = 0.0
+            self._sample_bytes = 0.0
+
+    def _active_time(self) -> float:
+        now = self._pause_start if self._pause_start is not None else self._clock()
+        return now - self._start - self._paused_total
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds of work so far, pauses excluded."""
+        with self._lock:
+            return self._active_time()
+
+    def pause(self):
+        with self._lock:
+            if self._pause_start is None:
+                self._pause_start = self._clock()
+
+    def resume(self):
+        with self._lock:
+            if self._pause_start is not None:
+                self._paused_total += self._clock() - self._pause_start
+                self._pause_start = None
+
+    def add_total(self, units: float = 0, nbytes: float = 0):
+        """Grow the totals, for work that is discovered while running."""
+        with self._lock:
+            self.total_units += units
+            self.total_bytes += nbytes
+
+    def advance(self, units: float = 1, nbytes: float = 0):
+        """Record units and bytes finished since the last call."""
+        with self._lock:
+            self._record(self.units_done + units, self.bytes_done + nbytes)
+
+    def update(self, units_done: float = None, bytes_done: float = None):
+        """Record cumulative progress."""
+        with self._lock:
+            self._record(self.units_done if units_done is None else units_done,
+                         self.bytes_done if bytes_done is None else bytes_done)
+
+    def _record(self, units_done: float, bytes_done: float):
+        self.units_done = units_done
+        self.bytes_done = bytes_done
+
+        now = self._active_time()
+        interval = now - self._sample_time
+        if interval < self.min_interval:
+            return
+
+        unit_rate = (units_done - self._sample_units) / interval
+        byte_rate = (bytes_done - self._sample_bytes) / interval
+        # Irregular sampling: weight the new rate by how much time it covers
+        weight = 1.0 - math.exp(-interval / self.smoothing) if self.smoothing > 0 else 1.0
+        if self._unit_rate is None:
+            self._unit_rate, self._byte_rate = unit_rate, byte_rate
+        else:
+            self._unit_rate += weight * (unit_rate - self._unit_rate)
+            self._byte_rate += weight * (byte_rate - self._byte_rate)
+
+        self._sample_time = now
+        self._sample_units = units_done
+        self._sample_bytes = bytes_done
+
+    @property
+    def units_per_sec(self) -> float:
+        with self._lock:
+            return self._unit_rate or 0.0
+
+    @property
+    def mb_per_sec(self) -> float:
+        with self._lock:
+            return (self._byte_rate or 0.0) / (1024 * 1024)
+
+    def eta_seconds(self):
+        """Seconds left, or None until there is a rate to go by."""
+        with self._lock:
+            if self.total_bytes > 0 and self._byte_rate:
+                remaining, rate = self.total_bytes - self.bytes_done, self._byte_rate
+            elif self.total_units > 0 and self._unit_rate:
+                remaining, rate = self.total_units - self.units_done, self._unit_rate
+            else:
+                return None
+            return max(0.0, remaining / rate) if rate > 0 else None
+
+    def rate_text(self) -> str:
+        """Live throughput, e.g. "3.2 pages/s | 1.4 MB/s"."""
+        text = f"{self.units_per_sec:.1f} {self.unit}/s"
+        if self.total_bytes or self.bytes_done:
+            text += f" | {self.mb_per_sec:.1f} MB/s"
+        return text
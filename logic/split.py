@@ -1,21 +1,87 @@
 # logic/split.py
 import os
+import re
+import logging
 import subprocess
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from PyPDF2 import PdfReader, PdfWriter
-import time
+import fitz  # PyMuPDF
 
-from gui.utils import truncate_filename
+from .ocr_writers import FITZ_LOCK
+from .utils import truncate_filename
+
+SPLIT_ENGINES = ("pypdf2", "optimized", "ghostscript")
+SPLIT_MODES = ("pages", "chunks", "ranges", "bookmarks", "size")
+
+_GS_PAGE_LINE = re.compile(r"^Page (\d+)\s*$")
+
+GS_PDFSETTINGS = {
+    "high": "/printer",
+    "medium": "/ebook",
+    "low": "/screen"
+}
 
 def split_pdf(input_pdf, 
               output_dir, 
               compress=False, 
               compression_level="medium", 
               update_callback=None, 
-              log_callback=None):
-    
+              log_callback=None,
+              throttle=None,
+              compress_workers=None,
+              engine="pypdf2",
+              stats=None,
+              mode="pages",
+              chunk_size=None,
+              ranges=None,
+              max_mb=None):
+    """
+    Split input_pdf into files in output_dir.
+
+    mode: how pages are grouped into files, see plan_split(): "pages" (one
+    file per page, the default), "chunks" (chunk_size pages each),
+    "ranges" (e.g. "1-3,4,5-"), "bookmarks" (one file per top-level
+    bookmark) or "size" (files of at most max_mb MB where possible).
+
+    engine: "pypdf2" writes each page with PyPDF2 and, when compressing,
+    runs Ghostscript on every page file. "ghostscript" splits (and
+    compresses) in a single Ghostscript pass over the whole document, so
+    shared fonts and images are decoded once and gs starts only once.
+    "optimized" copies each page with only the resources it actually uses
+    and its fonts subset to the glyphs on that page, so fonts and images
+    shared across the document are not duplicated in full into every file.
+
+    update_callback(pages_done, total_pages, bytes_done): called as output
+    files are written; bytes_done is the size of the files written so far
+    (before compression), for a live MB/s.
+    throttle: optional IOThrottle (logic.throttle) capping the pages/sec and
+    MB/sec written, for output folders on shared storage. Unthrottled by default.
+    Not supported by the ghostscript engine, where gs writes the pages itself.
+    compress_workers: Ghostscript processes run at once when compressing
+    (default: CPU count).
+    stats: optional dict filled with input_size, output_size (bytes, all
+    page files) and amplification (output_size / input_size). When
+    compressing page files with Ghostscript (engines other than
+    "ghostscript"), also compression: applied (False when Ghostscript was
+    not found and the files were left as split) and the compressed,
+    skipped and errors counts of files.
+    """
+
+    if engine not in SPLIT_ENGINES:
+        raise ValueError(f"Unknown split engine: {engine}. Use one of {SPLIT_ENGINES}")
+    if mode not in SPLIT_MODES:
+        raise ValueError(f"Unknown split mode: {mode}. Use one of {SPLIT_MODES}")
+    if engine == "ghostscript" and mode != "pages":
+        raise ValueError("The ghostscript engine only splits into single pages")
+    if engine == "ghostscript" and throttle is not None and throttle.enabled:
+        raise ValueError("The ghostscript engine cannot be throttled: gs writes the pages on its own")
+
     filename = os.path.splitext(os.path.basename(input_pdf))[0]
     generated_files = []
     total_pages = 0
+    compress_note = None
     compression_stats = {
         'success': 0, 
         'skipped': 0, 
@@ -32,65 +98,125 @@ def split_pdf(input_pdf,
         with open(input_pdf, 'rb') as infile:
             reader = PdfReader(infile)
             total_pages = len(reader.pages)
-            log_callback(f"\n▶ Processing {filename} ({total_pages} pages)")
+            if log_callback:
+                log_callback(f"\n▶ Processing {filename} ({total_pages} pages)")
 
-            for i in range(total_pages):
-                output_path = os.path.join(output_dir, f"{filename}_page_{i + 1}.pdf")
-                generated_files.append(output_path)
+            if engine == "ghostscript":
+                generated_files.extend(
+                    os.path.join(output_dir, f"{filename}_page_{i + 1}.pdf") for i in range(total_pages))
+                _split_with_ghostscript(input_pdf, output_dir, filename, total_pages, compress,
+                                        compression_level, update_callback, log_callback)
+                outputs_count = total_pages
+            else:
+                segments = plan_split(reader, mode, chunk_size=chunk_size, ranges=ranges, max_mb=max_mb)
+                outputs_count = len(segments)
+                # Ranges need not cover every page; progress counts the pages written
+                total_pages = sum(len(page_indices) for _, page_indices in segments)
+                if log_callback and mode != "pages":
+                    log_callback(f"  - {outputs_count} output files ({mode})")
 
-                # Split page
-                with PdfWriter() as writer:
-                    writer.add_page(reader.pages[i])
-                    with open(output_path, 'wb') as outfile:
-                        writer.write(outfile)
+                # Ghostscript runs in its own processes; threads only wait on them, so
+                # earlier files compress while later ones are still being split
+                workers = compress_workers or os.cpu_count() or 1
+                if compress and _find_ghostscript() is None:
+                    # Said once here instead of failing (and logging) on every file
+                    compress_note = "Ghostscript not found, split files left uncompressed"
+                    logging.warning(f"{filename}: {compress_note}")
+                    if log_callback:
+                        log_callback(f"⚠️ {compress_note}")
+                    compress = False
+                compressor = None
+                if compress:
+                    compressor = ThreadPoolExecutor(max_workers=workers)
+                pending = deque()  # (label, size before compression, future, pages), in order
+                pages_done = 0
+                bytes_done = 0  # Split files written so far, before compression
+                source = None
+                if engine == "optimized":
+                    with FITZ_LOCK:
+                        source = fitz.open(input_pdf)
+                try:
+                    for suffix, page_indices in segments:
+                        output_path = os.path.join(output_dir, f"{filename}{suffix}.pdf")
+                        generated_files.append(output_path)
 
-                # Get size before compression
-                original_size = os.path.getsize(output_path)
-                final_size = original_size
+                        # One writer pass per output file, however many pages it holds
+                        if source is not None:
+                            _write_optimized_pages(source, page_indices, output_path)
+                        else:
+                            with PdfWriter() as writer:
+                                for i in page_indices:
+                                    writer.add_page(reader.pages[i])
+                                with open(output_path, 'wb') as outfile:
+                                    writer.write(outfile)
 
-                # Handle compression
-                if compress:
-                    try:
-                        compression_worked, new_size = _compress_with_ghostscript(
-                            output_path, 
-                            compression_level
-                        )
-                        
-                        if compression_worked:
-                            compression_stats['success'] += 1
+                        # Get size before compression
+                        original_size = os.path.getsize(output_path)
+
+                        if throttle:
+                            throttle.wait(len(page_indices), original_size)
+
+                        if compressor:
+                            pending.append((_segment_label(page_indices), original_size, compressor.submit(
+                                _compress_with_ghostscript, output_path, compression_level), len(page_indices)))
+                            # Bound the files waiting for Ghostscript
+                            if len(pending) < 2 * workers:
+                                continue
+                            label, original_size, future, pages = pending.popleft()
+                            _collect_compression(label, original_size, future, compression_stats, log_callback)
                         else:
-                            compression_stats['skipped'] += 1
-                            
-                        final_size = new_size
-                    except Exception as e:
-                        compression_stats['errors'] += 1
-                        final_size = original_size  # File remains unchanged
-                        if log_callback:
-                            log_callback(f"⚠️ Compression error on page {i+1}: {str(e)}")
-
-                    # Update size tracking
-                    compression_stats['total_original'] += original_size
-                    compression_stats['total_compressed'] += final_size
-
-                # Update split progress
-                if log_callback:
-                    log_callback(f"SPLIT_PROGRESS:{i+1}/{total_pages}")
-
-                if update_callback:
-                    update_callback(i + 1, total_pages)
-                time.sleep(0.01)
+                            pages = len(page_indices)
+
+                        pages_done += pages
+                        bytes_done += original_size
+                        _report_split_progress(pages_done, total_pages, bytes_done, update_callback, log_callback)
+
+                    while pending:
+                        label, original_size, future, pages = pending.popleft()
+                        _collect_compression(label, original_size, future, compression_stats, log_callback)
+                        pages_done += pages
+                        bytes_done += original_size
+                        _report_split_progress(pages_done, total_pages, bytes_done, update_callback, log_callback)
+                finally:
+                    if compressor:
+                        compressor.shutdown(wait=True, cancel_futures=True)
+                    if source is not None:
+                        with FITZ_LOCK:
+                            source.close()
+
+            # Split files repeat what pages share (fonts, images); show how much that costs
+            input_size = os.path.getsize(input_pdf)
+            output_size = sum(os.path.getsize(f) for f in generated_files)
+            amplification = output_size / input_size if input_size else 0.0
+            if stats is not None:
+                stats.update(input_size=input_size, output_size=output_size,
+                             amplification=round(amplification, 3))
+                if engine != "ghostscript" and (compress or compress_note):
+                    stats["compression"] = {
+                        "applied": compress,
+                        "compressed": compression_stats['success'],
+                        "skipped": compression_stats['skipped'],
+                        "errors": compression_stats['errors']
+                    }
 
             # Final messages
             if log_callback:
-                message = f"\n  • {filename} split into {total_pages} files."
+                message = (f"\n  • {filename} split into {outputs_count} files."
+                           f"\n  - Output size: {output_size / (1024 * 1024):.2f} MB "
+                           f"({amplification:.2f}x the input)")
                 if not compress:
                     log_callback(message + '\n  - Split pages status: Uncompressed') 
 
-                if compress:                    
-                    _log_compression_summary(compression_stats, log_callback)
+                if compress:
+                    # gs compresses while splitting, so there are no per-file before/after sizes
+                    if engine != "ghostscript":
+                        _log_compression_summary(compression_stats, log_callback)
                     log_callback(message + '\n  - Split pages status: Compressed')
 
-        return True, f"\n{filename} split into {total_pages} files", generated_files
+        message = f"\n{filename} split into {outputs_count} files"
+        if compress_note:
+            message += f" ({compress_note})"
+        return True, message, generated_files
 
     except Exception as e:
         for f in generated_files:
@@ -98,6 +224,265 @@ def split_pdf(input_pdf,
             except: pass
         return False, f"Failed to split PDF: {str(e)}", []
     
+def _write_optimized_pages(source, page_indices, output_path):
+    """Write pages with only the resources they draw and subset fonts"""
+    # Split threads (the thread backend, the GUI) may run next to OCR's PyMuPDF calls
+    with FITZ_LOCK:
+        with fitz.open() as part_doc:
+            for start, end in _contiguous_runs(page_indices):
+                part_doc.insert_pdf(source, from_page=start, to_page=end)
+            # Removes fonts, images and forms the resources list but the content never uses
+            for page in part_doc:
+                page.clean_contents(sanitize=True)
+            try:
+                part_doc.subset_fonts()
+            except Exception as e:
+                # The file is still written, with its fonts whole
+                logging.warning(f"Could not subset fonts in {os.path.basename(output_path)}: {str(e)}")
+            part_doc.save(output_path, garbage=4, deflate=True)
+
+def _contiguous_runs(page_indices):
+    """[0, 1, 2, 5, 6] -> [(0, 2), (5, 6)]"""
+    runs = []
+    for i in page_indices:
+        if runs and i == runs[-1][1] + 1:
+            runs[-1][1] = i
+        else:
+            runs.append([i, i])
+    return [tuple(run) for run in runs]
+
+def _segment_label(page_indices):
+    if len(page_indices) == 1:
+        return f"page {page_indices[0] + 1}"
+    return f"pages {page_indices[0] + 1}-{page_indices[-1] + 1}"
+
+def _segment_suffix(page_indices):
+    """File name suffix: _page_3 for one page, _pages_3-7 for several"""
+    if len(page_indices) == 1:
+        return f"_page_{page_indices[0] + 1}"
+    return f"_pages_{page_indices[0] + 1}-{page_indices[-1] + 1}"
+
+# --------------------- Split planning ---------------------
+def plan_split(reader, mode="pages", chunk_size=None, ranges=None, max_mb=None):
+    """
+    Group the pages of a PdfReader into output files.
+
+    Returns a list of (file name suffix, [0-based page indices]):
+    - "pages": one file per page.
+    - "chunks": chunk_size consecutive pages per file.
+    - "ranges": 1-based, comma separated ranges, one file each, e.g.
+      "1-3,4,10-" (an open end runs to the last page). A range given
+      twice ("1-3,1-3") is written once; overlapping ranges each get
+      their file.
+    - "bookmarks": one file per top-level bookmark, from its page up to the
+      next one; pages before the first bookmark get their own file.
+    - "size": consecutive pages while their estimated size stays under
+      max_mb; a page bigger than that on its own gets its own file.
+    """
+    total_pages = len(reader.pages)
+    if mode == "pages":
+        groups = [[i] for i in range(total_pages)]
+    elif mode == "chunks":
+        if not chunk_size or chunk_size < 1:
+            raise ValueError("Chunk size must be at least 1 page")
+        groups = [list(range(start, min(start + chunk_size, total_pages)))
+                  for start in range(0, total_pages, chunk_size)]
+    elif mode == "ranges":
+        groups = parse_page_ranges(ranges, total_pages)
+    elif mode == "bookmarks":
+        return _plan_by_bookmarks(reader)
+    elif mode == "size":
+        if not max_mb or max_mb <= 0:
+            raise ValueError("Maximum file size must be greater than 0 MB")
+        groups = _plan_by_size(reader, max_mb * 1024 * 1024)
+    else:
+        raise ValueError(f"Unknown split mode: {mode}. Use one of {SPLIT_MODES}")
+    return [(_segment_suffix(group), group) for group in groups]
+
+def parse_page_ranges(spec, total_pages):
+    """"1-3,5,8-" -> [[0, 1, 2], [4], [7, ..., total_pages - 1]]; repeated ranges are dropped"""
+    groups = []
+    for part in (spec or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if "-" in part:
+                first, last = part.split("-", 1)
+                first = int(first) if first.strip() else 1
+                last = int(last) if last.strip() else total_pages
+            else:
+                first = last = int(part)
+        except ValueError:
+            raise ValueError(f"Invalid page range: '{part}'")
+        if not 1 <= first <= last <= total_pages:
+            raise ValueError(f"Page range '{part}' is outside 1-{total_pages}")
+        group = list(range(first - 1, last))
+        if group not in groups:  # Would write (and count) the same file again
+            groups.append(group)
+    if not groups:
+        raise ValueError("No page ranges given")
+    return groups
+
+def _plan_by_bookmarks(reader):
+    total_pages = len(reader.pages)
+    starts = []  # (first page, title)
+    for item in reader.outline:
+        if isinstance(item, list):
+            continue  # Children of the previous top-level entry
+        try:
+            page = reader.get_destination_page_number(item)
+        except Exception:
+            continue  # Bookmarks pointing at missing pages or named actions
+        if page is not None and 0 <= page < total_pages:
+            starts.append((page, str(item.title or "")))
+    if not starts:
+        raise ValueError("The PDF has no usable top-level bookmarks")
+
+    starts.sort(key=lambda start: start[0])
+    if starts[0][0] > 0:
+        starts.insert(0, (0, ""))  # Cover and front matter before the first bookmark
+
+    segments = []
+    for index, (first, title) in enumerate(starts):
+        last = starts[index + 1][0] if index + 1 < len(starts) else total_pages
+        if last <= first:
+            continue  # Several bookmarks on one page: the last one gets it
+        name = re.sub(r'[<>:"/\\|?*\x00-\x1f]', "", title).strip(" .")[:60]
+        suffix = f"_{len(segments) + 1:02d}" + (f"_{name}" if name else "")
+        segments.append((suffix, list(range(first, last))))
+    return segments
+
+def _plan_by_size(reader, max_bytes):
+    """Greedy grouping by the stream bytes each page adds to its file"""
+    groups = []
+    current, current_bytes, seen = [], 0, set()
+    for i, page in enumerate(reader.pages):
+        page_bytes = _estimate_page_bytes(page, seen)
+        if current and current_bytes + page_bytes > max_bytes:
+            groups.append(current)
+            # Resources shared with the previous file are written again in the new one
+            current, seen = [], set()
+            page_bytes = _estimate_page_bytes(page, seen)
+            current_bytes = 0
+        current.append(i)
+        current_bytes += page_bytes
+    if current:
+        groups.append(current)
+    return groups
+
+def _estimate_page_bytes(page, seen):
+    """
+    Approximate bytes a page adds to a file that already holds the objects
+    in seen: stream lengths plus a fixed cost per object. Fonts and images
+    already counted for the file are free.
+    """
+    total = 0
+    stack = [page.get("/Resources"), page.get("/Contents"), page.get("/Annots")]
+    while stack:
+        obj = stack.pop()
+        if obj is None:
+            continue
+        if hasattr(obj, "idnum"):  # IndirectObject
+            key = (obj.idnum, obj.generation)
+            if key in seen:
+                continue
+            seen.add(key)
+            total += 50
+            obj = obj.get_object()
+        if isinstance(obj, dict):
+            # PyPDF2 keeps a stream's raw (still encoded) bytes in _data
+            data = getattr(obj, "_data", None)
+            if data is not None:
+                total += len(data)
+            # /Parent and /P lead back to the page tree, not to this page's content
+            stack.extend(value for key, value in obj.items() if key not in ("/Parent", "/P", "/Length"))
+        elif isinstance(obj, list):
+            stack.extend(obj)
+    return total
+
+def _report_split_progress(pages_done, total_pages, bytes_done, update_callback, log_callback):
+    if log_callback:
+        log_callback(f"SPLIT_PROGRESS:{pages_done}/{total_pages}")
+    if update_callback:
+        update_callback(pages_done, total_pages, bytes_done)
+
+def _collect_compression(label, original_size, future, stats, log_callback):
+    """Wait for one file's Ghostscript run and add it to the compression stats"""
+    try:
+        compression_worked, final_size = future.result()
+        if compression_worked:
+            stats['success'] += 1
+        else:
+            stats['skipped'] += 1
+    except Exception as e:
+        stats['errors'] += 1
+        final_size = original_size  # File remains unchanged
+        if log_callback:
+            log_callback(f"⚠️ Compression error on {label}: {str(e)}")
+
+    # Update size tracking
+    stats['total_original'] += original_size
+    stats['total_compressed'] += final_size
+
+def _split_with_ghostscript(input_pdf, output_dir, filename, total_pages, compress, level,
+                            update_callback, log_callback):
+    """One Ghostscript run writing <filename>_page_<n>.pdf for every page"""
+    gs_cmd = _find_ghostscript()
+    if gs_cmd is None:
+        raise RuntimeError("Ghostscript not found")
+
+    # %d is replaced by the page number; a literal % in the path must be doubled
+    pattern = os.path.join(output_dir, filename).replace('%', '%%') + "_page_%d.pdf"
+    command = [gs_cmd, "-dNOPAUSE", "-dBATCH", "-dSAFER", "-sDEVICE=pdfwrite"]
+    if compress:
+        command.append(f"-dPDFSETTINGS={GS_PDFSETTINGS.get(level, '/ebook')}")
+    command += ["-sOutputFile=" + pattern, input_pdf]
+
+    process = subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        errors="replace",
+        creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0)  # Windows-only flag
+    )
+    output_tail = deque(maxlen=20)  # Kept for the error message
+    page_path = os.path.join(output_dir, filename) + "_page_{}.pdf"
+    started = 0
+    bytes_done = 0
+    try:
+        # gs prints "Page N" as it starts each page, so page N-1 is finished
+        for line in process.stdout:
+            match = _GS_PAGE_LINE.match(line)
+            if not match:
+                output_tail.append(line.strip())
+                continue
+            bytes_done = _finish_gs_page(started, total_pages, page_path, bytes_done,
+                                         update_callback, log_callback)
+            started = int(match.group(1))
+        returncode = process.wait()
+    except BaseException:
+        process.kill()
+        process.wait()
+        raise
+
+    if returncode != 0:
+        error_msg = "\n".join(line for line in output_tail if line) or "Unknown error"
+        raise RuntimeError(f"Ghostscript failed: {error_msg}")
+    _finish_gs_page(started, total_pages, page_path, bytes_done, update_callback, log_callback)
+
+def _finish_gs_page(page, total_pages, page_path, bytes_done, update_callback, log_callback):
+    """Report page as written and return bytes_done plus the size of its file"""
+    if not page:
+        return bytes_done
+    try:
+        bytes_done += os.path.getsize(page_path.format(page))
+    except OSError:
+        pass  # Progress only; the file is checked when the split ends
+    _report_split_progress(min(page, total_pages), total_pages, bytes_done, update_callback, log_callback)
+    return bytes_done
+
 def _log_compression_summary(stats, log_callback):
     """Helper to format compression statistics"""
     try:
@@ -115,9 +500,9 @@ def _log_compression_summary(stats, log_callback):
         
         summary = (
             "\n\nCompression Summary:\n"
-            f"• Successfully compressed: {stats['success']} pages\n"
-            f"• Skipped (no gain): {stats['skipped']} pages\n"
-            f"• Errors: {stats['errors']} pages\n"
+            f"• Successfully compressed: {stats['success']} files\n"
+            f"• Skipped (no gain): {stats['skipped']} files\n"
+            f"• Errors: {stats['errors']} files\n"
             f"• Total size before: {mb_original:.2f} MB\n"
             f"• Total size after: {mb_compressed:.2f} MB\n"
             f"• Space saved: {mb_saved:.2f} MB ({ratio:.1f}% reduction)"
@@ -126,10 +511,13 @@ def _log_compression_summary(stats, log_callback):
     except Exception as e:
         log_callback(f"\n⚠️ Failed to generate compression summary: {str(e)}")
 
-def _compress_with_ghostscript(pdf_path, level="medium"):
-    """Returns tuple: (compression_applied: bool, new_size: int)"""
+# lru_cache keeps a None result too: Ghostscript installed while the GUI is
+# running is only found after a restart
+@lru_cache(maxsize=None)
+def _find_ghostscript():
+    """Ghostscript command if it runs, else None. Probed once per process."""
+    gs_cmd = 'gswin64c' if os.name == 'nt' else 'gs'
     try:
-        gs_cmd = 'gswin64c' if os.name == 'nt' else 'gs'
         subprocess.run(
             [gs_cmd, "--version"],
             check=True,
@@ -137,14 +525,15 @@ def _compress_with_ghostscript(pdf_path, level="medium"):
             stderr=subprocess.DEVNULL
         )
     except (FileNotFoundError, subprocess.CalledProcessError):
+        return None
+    return gs_cmd
+
+def _compress_with_ghostscript(pdf_path, level="medium"):
+    """Returns tuple: (compression_applied: bool, new_size: int)"""
+    gs_cmd = _find_ghostscript()
+    if gs_cmd is None:
         raise RuntimeError("Ghostscript not found")
 
-    levels = {
-        "high": "/printer",
-        "medium": "/ebook",
-        "low": "/screen"
-    }
-    
     temp_path = f"{pdf_path}_temp"
     original_size = os.path.getsize(pdf_path)
     size_threshold = 0.99  # Require 1% reduction
@@ -157,13 +546,13 @@ def _compress_with_ghostscript(pdf_path, level="medium"):
                 "-dNOPAUSE",
                 "-dBATCH",
                 "-sDEVICE=pdfwrite",
-                f"-dPDFSETTINGS={levels.get(level, '/ebook')}",
+                f"-dPDFSETTINGS={GS_PDFSETTINGS.get(level, '/ebook')}",
                 "-sOutputFile=" + temp_path,
                 pdf_path
             ],
             check=True,
             stderr=subprocess.PIPE,
-            creationflags=subprocess.CREATE_NO_WINDOW
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0)  # Windows-only flag
         )
 
         new_size = os.path.getsize(temp_path)
@@ -0,0 +1,60 @@
+# logic/throttle.py
+import threading
+import time
+
+class IOThrottle:
+    """
+    Caps the rate at which an operation writes pages and bytes, for jobs on
+    shared storage that should not saturate it.
+
+    Call wait(pages, nbytes) after each write; it sleeps just long enough
+    to keep the running average under the limits. A limit of None (or 0)
+    is not enforced, so IOThrottle() never sleeps. Thread-safe: one
+    throttle can be shared by several workers to cap their combined rate.
+    """
+
+    def __init__(self, max_pages_per_sec: float = None, max_mb_per_sec: float = None,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.max_pages_per_sec = max_pages_per_sec or None
+        self.max_bytes_per_sec = max_mb_per_sec * 1024 * 1024 if max_mb_per_sec else None
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._start = None
+        self._pages = 0
+        self._bytes = 0
+
+    def __getstate__(self):
+        # Sent to worker processes without the lock; each process throttles on its own
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.max_pages_per_sec or self.max_bytes_per_sec)
+
+    def wait(self, pages: int = 1, nbytes: int = 0):
+        """Account for pages and bytes just written and sleep if over the limits."""
+        if not self.enabled:
+            return
+        with self._lock:
+            now = self._clock()
+            if self._start is None:
+                self._start = now
+            self._pages += pages
+            self._bytes += nbytes
+
+            # Earliest time at which the work done so far is within the limits
+            due = self._start
+            if self.max_pages_per_sec:
+                due = max(due, self._start + self._pages / self.max_pages_per_sec)
+            if self.max_bytes_per_sec:
+                due = max(due, self._start + self._bytes / self.max_bytes_per_sec)
+            delay = due - now
+        if delay > 0:
+            self._sleep(delay)
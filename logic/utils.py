@@ -0,0 +1,69 @@
+# logic/utils.py
+# Helpers shared by the logic layer. Must not import tkinter so the
+# operations stay usable from the headless CLI.
+import sys
+
+def truncate_filename(file: str, 
+                      ellipsis: str = "-->", 
+                      max_length: int = 50) -> str:
+    
+    if len(file) <= max_length:
+        return file
+    
+    # Calculate available space for the beginning and the end of the filename
+    space_for_parts = max_length - len(ellipsis)
+    if space_for_parts <= 0:
+        raise ValueError("max_length must be greater than the length of the ellipsis.")
+    
+    # Divide the available space between the beginning and end of the filename
+    part_length = space_for_parts // 2
+    
+    # Truncate the filename and add the ellipsis in the middle
+    truncated_file = file[:part_length] + ellipsis + file[-part_length:]
+    
+    return truncated_file
+
+def peak_rss_bytes():
+    """
+    Peak resident memory of this process so far, in bytes (None where it
+    cannot be read). This is the high-water mark of the whole process, not
+    of one operation.
+    """
+    try:
+        import resource
+    except ImportError:
+        return _peak_rss_windows()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def _peak_rss_windows():
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        get_current_process = ctypes.windll.kernel32.GetCurrentProcess
+        get_current_process.restype = wintypes.HANDLE
+        get_memory_info = ctypes.windll.psapi.GetProcessMemoryInfo
+        get_memory_info.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESS_MEMORY_COUNTERS), wintypes.DWORD]
+        if not get_memory_info(get_current_process(), ctypes.byref(counters), counters.cb):
+            return None
+        return counters.PeakWorkingSetSize
+    except Exception:
+        return None
@@ -0,0 +1,334 @@
+# pdftools.py
+"""
+Headless command-line entry point for PDF Tools.
+
+Runs the logic/ operations directly, without importing Tkinter or starting
+the GUI, and prints a JSON report on stdout:
+
+    python pdftools.py compress <files or folders> [--level high] [--workers 8]
+    python pdftools.py merge a.pdf b.pdf -o merged.pdf [--compress]
+    python pdftools.py split big.pdf -o out_dir [--compress]
+    python pdftools.py ocr scan.pdf -o out_dir [--lang eng] [--format rtf|pdf]
+
+The exit code is 0 when every item succeeded and 1 otherwise.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import as_completed
+
+from logic.ocr_cache import DEFAULT_CACHE_PATH, DEFAULT_CACHE_MAX_MB
+
+
+def collect_pdfs(paths):
+    """Expand folders into the PDFs they contain, keeping explicit files as given."""
+    from logic.compression import find_pdfs
+
+    pdf_files = []
+    for path in paths:
+        if os.path.isdir(path):
+            pdf_files.extend(find_pdfs(path))
+        else:
+            pdf_files.append(path)
+    return pdf_files
+
+
+def compress_output_path(pdf_file, output_dir=None, in_place=False):
+    """Same naming as the GUI: <name>_compressed.pdf next to the input or in output_dir."""
+    if in_place:
+        return pdf_file
+    base = os.path.splitext(os.path.basename(pdf_file))[0]
+    folder = output_dir or os.path.dirname(pdf_file)
+    return os.path.join(folder, f"{base}_compressed.pdf")
+
+
+# --------------------- Subcommands ---------------------
+def run_compress(args):
+    from logic.compression import compress_pdf, create_executor
+
+    pdf_files = collect_pdfs(args.inputs)
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    results = []
+    with create_executor(args.backend, max_workers=args.workers) as executor:
+        futures = {executor.submit(
+            compress_pdf,
+            pdf_file,
+            compress_output_path(pdf_file, args.output_dir, args.in_place),
+            level=args.level,
+            overwrite=args.in_place
+        ): pdf_file for pdf_file in pdf_files}
+
+        for future in as_completed(futures):
+            pdf_file = futures[future]
+            try:
+                success, message, original_size, compressed_size = future.result()
+            except Exception as e:
+                success, message, original_size, compressed_size = False, str(e), 0, 0
+            results.append({
+                "input": pdf_file,
+                "success": success,
+                "output": message if success else None,
+                "error": None if success else message,
+                "original_size": original_size,
+                "compressed_size": compressed_size
+            })
+
+    return results
+
+
+def run_merge(args):
+    from logic.merging import merge_pdfs
+
+    success, summary, error = merge_pdfs(
+        collect_pdfs(args.inputs),
+        args.output,
+        compress_before_merge=args.compress,
+        compression_level=args.level,
+        engine=args.engine,
+        buffer_mb=args.buffer_mb,
+        workers=args.workers,
+        backend=args.backend,
+        spill_mb=args.spill_mb,
+        compress_after_merge=args.compress_after,
+        bookmarks=args.bookmarks,
+        keep_outlines=args.keep_outlines
+    )
+    return [{
+        "output": args.output,
+        "success": success,
+        "error": error,
+        "summary": summary
+    }]
+
+
+def split_file(pdf_file, output_dir, **options):
+    """Worker entry point: split one file and return split_pdf's result plus its size stats."""
+    from logic.split import split_pdf
+
+    stats = {}
+    return (*split_pdf(pdf_file, output_dir, stats=stats, **options), stats)
+
+
+def run_split(args):
+    from logic.compression import create_executor
+    from logic.throttle import IOThrottle
+
+    pdf_files = collect_pdfs(args.inputs)
+    os.makedirs(args.output_dir, exist_ok=True)
+    throttle = IOThrottle(args.max_pages_per_sec, args.max_mb_per_sec)
+    # The limits are for the whole run: worker processes would each get a copy of
+    # the throttle and together write workers times as fast, so threads share one
+    backend = "thread" if throttle.enabled else args.backend
+
+    results = []
+    with create_executor(backend, max_workers=args.workers) as executor:
+        futures = {executor.submit(
+            split_file,
+            pdf_file,
+            args.output_dir,
+            compress=args.compress,
+            compression_level=args.level,
+            throttle=throttle if throttle.enabled else None,
+            compress_workers=args.compress_workers,
+            engine=args.engine,
+            mode=args.mode,
+            chunk_size=args.chunk_size,
+            ranges=args.ranges,
+            max_mb=args.max_mb
+        ): pdf_file for pdf_file in pdf_files}
+
+        for future in as_completed(futures):
+            pdf_file = futures[future]
+            try:
+                success, message, generated_files, stats = future.result()
+            except Exception as e:
+                success, message, generated_files, stats = False, str(e), [], None
+            results.append({
+                "input": pdf_file,
+                "success": success,
+                "message": message.strip(),
+                "outputs": generated_files,
+                "stats": stats
+            })
+
+    return results
+
+
+def ocr_file(pdf_file, output_dir, language, cache_path=None, cache_max_mb=None, **options):
+    """Worker entry point: OCR one file and return (output_path, page stats)."""
+    from logic.ocr import ocr_pdf
+    from logic.ocr_cache import OCRCache
+
+    stats = {}
+    cache = OCRCache(cache_path, int(cache_max_mb * 1024 * 1024)) if cache_path else None
+    try:
+        output_path = ocr_pdf(pdf_file, output_dir, language, stats=stats, cache=cache, **options)
+    finally:
+        if cache:
+            cache.close()
+    return output_path, stats
+
+
+def run_ocr(args):
+    from logic.compression import create_executor
+
+    pdf_files = collect_pdfs(args.inputs)
+    results = []
+    with create_executor(args.backend, max_workers=args.workers) as executor:
+        futures = {}
+        for pdf_file in pdf_files:
+            output_dir = args.output_dir or os.path.dirname(pdf_file)
+            os.makedirs(output_dir, exist_ok=True)
+            futures[executor.submit(
+                ocr_file,
+                pdf_file,
+                output_dir,
+                args.lang,
+                output_format=args.format,
+                workers=args.page_workers,
+                engine=args.engine,
+                dpi=args.dpi,
+                colorspace=args.colorspace,
+                binarize=args.binarize,
+                deskew=args.deskew,
+                use_text_layer=not args.force_ocr,
+                resume=not args.no_resume,
+                prefetch=args.prefetch,
+                cache_path=None if args.no_cache else args.cache_path,
+                cache_max_mb=args.cache_max_mb
+            )] = pdf_file
+
+        for future in as_completed(futures):
+            pdf_file = futures[future]
+            try:
+                output_path, stats = future.result()
+                results.append({"input": pdf_file, "success": True, "output": output_path, "error": None, "stats": stats})
+            except Exception as e:
+                results.append({"input": pdf_file, "success": False, "output": None, "error": str(e), "stats": None})
+
+    return results
+
+
+# --------------------- Argument Parsing ---------------------
+def add_parallel_options(parser, default_backend="process"):
+    parser.add_argument('--workers', '-w', type=int, default=None,
+                        help='Number of parallel workers (default: CPU count)')
+    parser.add_argument('--backend', choices=["thread", "process"], default=default_backend,
+                        help=f'Worker pool type (default: {default_backend})')
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='pdftools', description='Headless PDF Tools: compress, merge, split and OCR PDF files')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    levels = ["high", "medium", "low"]
+
+    compress = subparsers.add_parser('compress', help='Compress PDF files or folders of PDFs')
+    compress.add_argument('inputs', nargs='+', help='PDF files and/or folders (searched recursively)')
+    compress.add_argument('--level', '-l', choices=levels, default='medium', help='Compression level')
+    compress.add_argument('--output-dir', '-o', default=None, help='Folder for compressed files (default: next to each input)')
+    compress.add_argument('--in-place', action='store_true', help='Replace the original files')
+    add_parallel_options(compress)
+    compress.set_defaults(handler=run_compress)
+
+    merge = subparsers.add_parser('merge', help='Merge PDF files into one document')
+    merge.add_argument('inputs', nargs='+', help='PDF files and/or folders, merged in the given order (a folder\'s files by name)')
+    merge.add_argument('--output', '-o', required=True, help='Merged PDF path')
+    merge.add_argument('--compress', action='store_true', help='Compress each file before merging')
+    merge.add_argument('--compress-after', action='store_true',
+                       help='Compress the merged file as a whole, removing images and fonts repeated across inputs')
+    merge.add_argument('--level', '-l', choices=levels, default='medium', help='Compression level')
+    merge.add_argument('--bookmarks', action='store_true',
+                       help='Add a bookmark for each input file, pointing at its first page')
+    merge.add_argument('--no-outlines', dest='keep_outlines', action='store_false',
+                       help="Drop the input files' own bookmarks")
+    merge.add_argument('--engine', choices=["pypdf2", "pikepdf"], default='pypdf2',
+                       help='pikepdf keeps memory bounded on large batches (default: pypdf2)')
+    merge.add_argument('--buffer-mb', type=float, default=256,
+                       help='Input MB the pikepdf engine holds in memory before spilling to disk (default: 256)')
+    merge.add_argument('--spill-mb', type=float, default=64,
+                       help='Compressed files larger than this go to a temp file instead of memory (default: 64)')
+    add_parallel_options(merge)  # Workers compress files ahead of the merge with --compress
+    merge.set_defaults(handler=run_merge)
+
+    split = subparsers.add_parser('split', help='Split PDF files into single pages, chunks, ranges or bookmarks')
+    split.add_argument('inputs', nargs='+', help='PDF files and/or folders to split')
+    split.add_argument('--output-dir', '-o', required=True, help='Folder for the split pages')
+    split.add_argument('--mode', choices=["pages", "chunks", "ranges", "bookmarks", "size"], default='pages',
+                       help='One file per page (default), per --chunk-size pages, per --ranges entry, '
+                            'per top-level bookmark, or per --max-mb of output')
+    split.add_argument('--chunk-size', type=int, default=None, help='Pages per file for --mode chunks')
+    split.add_argument('--ranges', default=None, help='Page ranges for --mode ranges, e.g. "1-3,4,10-"')
+    split.add_argument('--max-mb', type=float, default=None, help='Target file size for --mode size')
+    split.add_argument('--compress', action='store_true', help='Compress split pages with Ghostscript')
+    split.add_argument('--level', '-l', choices=levels, default='medium', help='Compression level')
+    split.add_argument('--engine', choices=["pypdf2", "optimized", "ghostscript"], default='pypdf2',
+                       help='optimized subsets fonts and drops unused resources per page; '
+                            'ghostscript splits (and compresses) in a single gs pass (default: pypdf2)')
+    split.add_argument('--compress-workers', type=int, default=None,
+                       help='Ghostscript processes per file when compressing (default: CPU count)')
+    split.add_argument('--max-pages-per-sec', type=float, default=None,
+                       help='Limit the rate split pages are written at, across all workers; '
+                            'runs the workers as threads (default: unlimited)')
+    split.add_argument('--max-mb-per-sec', type=float, default=None,
+                       help='Limit the MB/sec written across all workers, e.g. on shared storage; '
+                            'runs the workers as threads (default: unlimited)')
+    add_parallel_options(split)
+    split.set_defaults(handler=run_split)
+
+    ocr = subparsers.add_parser('ocr', help='OCR PDF files to DOCX, RTF or searchable PDF')
+    ocr.add_argument('inputs', nargs='+', help='PDF files and/or folders to OCR')
+    ocr.add_argument('--output-dir', '-o', default=None, help='Folder for OCR results (default: next to each input)')
+    ocr.add_argument('--lang', default='ron', help='Tesseract language(s), e.g. eng or deu+eng')
+    ocr.add_argument('--format', '-f', choices=["docx", "rtf", "pdf"], default='docx',
+                     help='Output format; pdf adds an invisible text layer to a copy of the input')
+    ocr.add_argument('--page-workers', type=int, default=1,
+                     help='Processes recognizing pages of each file in parallel (default: 1)')
+    ocr.add_argument('--engine', choices=["auto", "tesserocr", "pytesseract"], default='auto',
+                     help='OCR engine; auto uses tesserocr when installed (default: auto)')
+    ocr.add_argument('--prefetch', type=int, default=2,
+                     help='Pages rendered ahead of recognition; bounds memory (default: 2)')
+    ocr.add_argument('--dpi', type=int, default=300, help='Render resolution (default: 300)')
+    ocr.add_argument('--colorspace', choices=["gray", "rgb"], default='gray', help='Render colorspace (default: gray)')
+    ocr.add_argument('--binarize', action='store_true', help='Binarize pages before OCR')
+    ocr.add_argument('--deskew', action='store_true', help='Deskew pages before OCR')
+    ocr.add_argument('--force-ocr', action='store_true',
+                     help='OCR every page, even pages that already have a text layer')
+    ocr.add_argument('--cache-path', default=DEFAULT_CACHE_PATH, help=f'OCR result cache file (default: {DEFAULT_CACHE_PATH})')
+    ocr.add_argument('--cache-max-mb', type=float, default=DEFAULT_CACHE_MAX_MB, help='Cache size limit in MB')
+    ocr.add_argument('--no-cache', action='store_true', help='Do not read or write the OCR result cache')
+    ocr.add_argument('--no-resume', action='store_true',
+                     help='Do not checkpoint pages, resume interrupted files or skip finished ones')
+    add_parallel_options(ocr)
+    ocr.set_defaults(handler=run_ocr)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if (args.command == "split" and args.engine == "ghostscript"
+            and (args.max_pages_per_sec or args.max_mb_per_sec)):
+        parser.error("--max-pages-per-sec/--max-mb-per-sec cannot limit the ghostscript engine")
+
+    start_time = time.time()
+    results = args.handler(args)
+    report = {
+        "command": args.command,
+        "success": all(item["success"] for item in results),
+        "elapsed_seconds": round(time.time() - start_time, 3),
+        "results": results
+    }
+
+    json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write("\n")
+    return 0 if report["success"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,27 @@
+# tests/conftest.py
+import os
+import sys
+
+import pytest
+from pikepdf import Pdf, String
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    """Write a PDF of blank pages, each tagged with /Tag "<tag>-<page index>"."""
+    def make(name, pages=1, tag=None):
+        path = tmp_path / name
+        pdf = Pdf.new()
+        for i in range(pages):
+            pdf.add_blank_page()
+            pdf.pages[-1].Tag = String(f"{tag or path.stem}-{i}")
+        pdf.save(path)
+        return str(path)
+    return make
+
+
+def page_tags(path):
+    with Pdf.open(path) as pdf:
+        return [str(page.Tag) for page in pdf.pages]
@@ -0,0 +1,17 @@
+# tests/test_compression.py
+import os
+import stat
+
+import pytest
+
+from logic.compression import optimize_merged_pdf
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permission bits")
+def test_optimize_merged_pdf_keeps_file_mode(make_pdf):
+    path = make_pdf("merged.pdf", pages=2)
+    os.chmod(path, 0o644)
+
+    optimize_merged_pdf(path)
+
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
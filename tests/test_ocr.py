@@ -0,0 +1,45 @@
+# tests/test_ocr.py
+import os
+import zipfile
+
+import fitz
+
+from logic.ocr import ocr_pdf
+from logic.ocr_writers import DocxStreamWriter, PARTIAL_SUFFIX
+
+
+def _text_pdf(path, lines):
+    """Pages with enough text to be taken from the text layer, without an OCR engine."""
+    doc = fitz.open()
+    for line in lines:
+        doc.new_page().insert_text((72, 72), f"{line} " * 20)
+    doc.save(path)
+    doc.close()
+
+
+def _document_xml(path):
+    with zipfile.ZipFile(path) as package:
+        return package.read("word/document.xml").decode("utf-8")
+
+
+def test_stale_docx_part_is_recovered_before_a_new_run(tmp_path):
+    source = str(tmp_path / "scan.pdf")
+    _text_pdf(source, ["fresh page"])
+    output_path = str(tmp_path / "OCR_scan.docx")
+
+    # A run that died after one page and a half
+    writer = DocxStreamWriter(output_path)
+    writer.write_page("old page")
+    writer.abort()
+    with open(output_path + PARTIAL_SUFFIX, "a", encoding="utf-8") as part:
+        part.write("<w:p><w:r><w:t>cut o")
+
+    stats = {}
+    result = ocr_pdf(source, str(tmp_path), "eng", use_text_layer=True, stats=stats)
+
+    recovered_path = str(tmp_path / "OCR_scan_recovered.docx")
+    assert stats["recovered_path"] == recovered_path
+    assert "old page" in _document_xml(recovered_path)
+    assert "cut o" not in _document_xml(recovered_path)
+    assert "fresh page" in _document_xml(result)
+    assert not os.path.exists(output_path + PARTIAL_SUFFIX)
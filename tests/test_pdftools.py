@@ -0,0 +1,20 @@
+# tests/test_pdftools.py
+import json
+import os
+
+import pdftools
+from conftest import page_tags
+
+
+def test_merge_folder_in_name_order(tmp_path, make_pdf, capsys):
+    folder = tmp_path / "folder"
+    (folder / "sub").mkdir(parents=True)
+    for name in ("f2", "f0", "f3", "f1", os.path.join("sub", "a")):
+        make_pdf(os.path.join("folder", f"{name}.pdf"), tag=os.path.basename(name))
+    output = str(tmp_path / "out.pdf")
+
+    exit_code = pdftools.main(["merge", str(folder), "-o", output])
+
+    assert exit_code == 0
+    assert json.loads(capsys.readouterr().out)["success"]
+    assert page_tags(output) == ["f0-0", "f1-0", "f2-0", "f3-0", "a-0"]
@@ -0,0 +1,32 @@
+# tests/test_split.py
+import os
+
+from logic import split
+
+
+def test_split_without_ghostscript_leaves_files_uncompressed(tmp_path, make_pdf, monkeypatch):
+    monkeypatch.setattr(split, "_find_ghostscript", lambda: None)
+    source = make_pdf("doc.pdf", pages=3)
+    logs = []
+    stats = {}
+
+    success, message, outputs = split.split_pdf(source, str(tmp_path), compress=True,
+                                                log_callback=logs.append, stats=stats)
+
+    assert success and len(outputs) == 3
+    assert "Ghostscript not found" in message
+    assert sum("Ghostscript not found" in line for line in logs) == 1
+    assert stats["compression"] == {"applied": False, "compressed": 0, "skipped": 0, "errors": 0}
+
+
+def test_repeated_ranges_are_written_once(tmp_path, make_pdf):
+    source = make_pdf("doc.pdf", pages=5)
+    stats = {}
+
+    success, _, outputs = split.split_pdf(source, str(tmp_path), mode="ranges",
+                                          ranges="1-3, 1-3, 3-3, 3, 2-4", stats=stats)
+
+    assert success
+    assert [os.path.basename(path) for path in outputs] == [
+        "doc_pages_1-3.pdf", "doc_page_3.pdf", "doc_pages_2-4.pdf"]
+    assert stats["output_size"] == sum(os.path.getsize(path) for path in outputs)